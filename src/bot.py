@@ -1,4 +1,3 @@
-import json
 import sys
 from typing import Optional
 
@@ -15,6 +14,24 @@ from src.schemas import (
 )
 from src.strategy_register import STRATEGY_REGISTRY
 
+try:
+    # orjson parses and serialises the per-tick JSON several times faster when installed
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as json_loads
+
+    def json_dumps(obj) -> str:
+        return _orjson_dumps(obj).decode()
+
+except ImportError:
+    from json import dumps as json_dumps
+    from json import loads as json_loads
+
+# Position delta -> move string; deltas outside the table mean WAIT
+_DELTA_TO_MOVE: dict[tuple[int, int], str] = {
+    (direction.value.x, direction.value.y): Direction.to_str(direction)
+    for direction in Direction
+}
+
 
 class CollectorBot:
     """
@@ -45,7 +62,6 @@ class CollectorBot:
             raise ValueError(f"Unknown strategy: {strategy}")
         self.strategy = strategy_cls() if callable(strategy_cls) else strategy_cls
         self.game_state: Optional[GameState] = None
-        self.recent_positions: list[Coords] = []
         self.random_moves_left = 0
         self.normal_search_directions = [
             Direction.LEFT,
@@ -82,8 +98,7 @@ class CollectorBot:
         # Map position delta to direction
         dx = next_pos.x - self.game_state.bot.x
         dy = next_pos.y - self.game_state.bot.y
-        move_direction = Direction.from_delta(Coords(x=dx, y=dy))
-        move = Direction.to_str(move_direction)
+        move = _DELTA_TO_MOVE.get((dx, dy), "WAIT")
         return move, next_path
 
     def run(self):
@@ -104,9 +119,18 @@ class CollectorBot:
         # Reads from stdin, prints moves to stdout
         """
         first_tick = True
-
-        for line in sys.stdin:
-            data = json.loads(line)
+        # The engine waits for each move, so every tick still ends in a flush
+        out_write = sys.stdout.write
+        out_flush = sys.stdout.flush
+        # stderr is line buffered, so every log line costs a write syscall; buffer it
+        # and flush once per tick instead
+        if hasattr(sys.stderr, "reconfigure"):
+            sys.stderr.reconfigure(line_buffering=False)
+        err_flush = sys.stderr.flush
+
+        # Both orjson and json accept bytes, so skip the TextIOWrapper decode step
+        for line in sys.stdin.buffer:
+            data = json_loads(line)
             if first_tick:
                 config = GameConfig.from_dict(data.get("config"))
                 data.pop("config", None)
@@ -139,8 +163,6 @@ class CollectorBot:
                 ]
             }
             highlight_coords.clear()
-            print(
-                f"{move} {json.dumps(highlight)}",
-                flush=True,
-            )
-            self.game_state.last_bot_pos = self.game_state.bot
+            out_write(f"{move} {json_dumps(highlight)}\n")
+            out_flush()
+            err_flush()
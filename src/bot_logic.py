@@ -1,9 +1,20 @@
-import itertools
 from functools import lru_cache
 
-from src.pathfinding import cached_find_path, manhattan
+from src.pathfinding import (
+    bfs_paths,
+    build_neighbor_table,
+    build_wall_grid,
+    cached_find_path,
+    label_components,
+    manhattan,
+)
 from src.schemas import Coords, EnemyBot, Gem, ViewPoint, Wall
 
+# Offsets blocked around each enemy: its own tile, plus the tiles it can step onto
+# when it moves first
+_ENEMY_TILE = ((0, 0),)
+_ENEMY_REACH = ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1))
+
 
 def get_bot2gems_distances(
     bot_pos: Coords,
@@ -13,9 +24,9 @@ def get_bot2gems_distances(
     Compute Manhattan distances from the bot to each gem.
 
     """
+    bx, by = bot_pos.x, bot_pos.y
     for gem in gems:
-        distance = manhattan(bot_pos, gem.position)
-        gem.distance2bot = distance
+        gem.distance2bot = abs(gem.position.x - bx) + abs(gem.position.y - by)
     return gems
 
 
@@ -26,9 +37,9 @@ def get_enemy2gems_distances(
     """
     Compute Manhattan distances from an enemy to each gem.
     """
+    ex, ey = enemy_pos.x, enemy_pos.y
     for gem in gems:
-        distance = manhattan(enemy_pos, gem.position)
-        gem.distance2enemies.append(distance)
+        gem.distance2enemies.append(abs(gem.position.x - ex) + abs(gem.position.y - ey))
     return gems
 
 
@@ -40,17 +51,20 @@ def get_bot_enemy_2_gem_distances(
     """
     Compute distances from the bot and enemies to a single gem.
     """
-    distance = manhattan(bot_pos, gem.position)
-    gem.distance2bot = distance
-    for enemy in enemies:
-        enemy_distance = manhattan(enemy.position, gem.position)
-        gem.distance2enemies.append(enemy_distance)
+    gem.distance2bot = manhattan(bot_pos, gem.position)
+    gem.distance2enemies = [
+        manhattan(enemy.position, gem.position) for enemy in enemies
+    ]
     return gem
 
 
 def analyze_enemies(enemies: list[EnemyBot], gems: list[Gem]) -> list[Gem]:
-    for enemy in enemies:
-        gems = get_enemy2gems_distances(enemy.position, gems)
+    # One pass over the gems, in enemy order; each call replaces the previous
+    # distances so gems reused across ticks never carry stale entries
+    enemy_xy = [(enemy.position.x, enemy.position.y) for enemy in enemies]
+    for gem in gems:
+        gx, gy = gem.position.x, gem.position.y
+        gem.distance2enemies = [abs(gx - ex) + abs(gy - ey) for ex, ey in enemy_xy]
     return gems
 
 
@@ -60,19 +74,29 @@ def check_reachable_gem(
     walls: set[Coords],
     width: int,
     height: int,
+    distance_matrix=None,
 ) -> bool:
-    gem_path = cached_find_path(
-        start=bot_pos,
-        goal=gem.position,
-        forbidden=walls,
-        width=width,
-        height=height,
+    # A path is never shorter than the Manhattan distance, so a gem further away than
+    # its TTL is ruled out without a search
+    if abs(bot_pos.x - gem.position.x) + abs(bot_pos.y - gem.position.y) > gem.ttl:
+        return False
+    # The game state's distance matrix already holds this tick's bot-to-gem paths;
+    # only pairs missing from it need a search
+    key = (bot_pos, gem.position)
+    if distance_matrix is not None and key in distance_matrix:
+        length = distance_matrix[key]
+        return length != float("inf") and length - 1 <= gem.ttl
+    # The path includes the start tile, and an empty one means no path at all
+    path_len = len(
+        cached_find_path(
+            start=bot_pos,
+            goal=gem.position,
+            forbidden=walls,
+            width=width,
+            height=height,
+        )
     )
-    if len(gem_path) > 0 and len(gem_path) - 1 <= gem.ttl:
-        reachable = True
-    else:
-        reachable = False
-    return reachable
+    return 0 < path_len <= gem.ttl + 1
 
 
 def get_distances(
@@ -82,10 +106,14 @@ def get_distances(
 ) -> list[Gem]:
     """
     Compute distances from the bot and enemies to each gem.
-
+    Enemy coordinates are unpacked once so the per-gem work is plain int arithmetic.
     """
-    gems = get_bot2gems_distances(bot_pos, gems)
-    gems = analyze_enemies(enemies, gems)
+    bx, by = bot_pos.x, bot_pos.y
+    enemy_xy = [(enemy.position.x, enemy.position.y) for enemy in enemies]
+    for gem in gems:
+        gx, gy = gem.position.x, gem.position.y
+        gem.distance2bot = abs(gx - bx) + abs(gy - by)
+        gem.distance2enemies = [abs(gx - ex) + abs(gy - ey) for ex, ey in enemy_xy]
     return gems
 
 
@@ -104,26 +132,26 @@ def find_viewpoints(
         set: A set of viewpoints (Coords).
     """
     viewpoints = set()
+    # One pass over the map: tile counts per viewpoint, and for each dead end the
+    # viewpoints that can see it, instead of testing every viewpoint per dead end
+    visibility = {}
+    seers: dict[Coords, list[Coords]] = {}
+    for vp, viewpoint in visibility_map.items():
+        visibility[vp] = len(viewpoint.visible_tiles)
+        for dead_end in viewpoint.visible_tiles & dead_ends:
+            seers.setdefault(dead_end, []).append(vp)
 
     for dead_end in dead_ends:
-        # Filter viewpoints that can see the dead end
-        visible_viewpoints = {
-            vp
-            for vp in visibility_map.keys()
-            if dead_end in visibility_map.get(vp, ViewPoint(position=vp)).visible_tiles
-        }
-
-        if visible_viewpoints:
-            # Find the viewpoint that maximizes visibility of the dead end and its surroundings
-            best_viewpoint = max(
-                visible_viewpoints,
-                key=lambda vp: (
-                    len(
-                        visibility_map.get(vp, ViewPoint(position=vp)).visible_tiles
-                    ),  # Total visibility
-                    manhattan(dead_end, vp),  # Distance from the dead end
-                ),
-            )
+        # Keep the viewpoint that maximizes total visibility, then distance from the
+        # dead end, in a single pass over the viewpoints that can see it
+        dx, dy = dead_end.x, dead_end.y
+        best_viewpoint = None
+        best_key = (-1, -1)
+        for vp in seers.get(dead_end, ()):
+            key = (visibility[vp], abs(vp.x - dx) + abs(vp.y - dy))
+            if key > best_key:
+                best_key, best_viewpoint = key, vp
+        if best_viewpoint is not None:
             viewpoints.add(best_viewpoint)
 
     return viewpoints
@@ -143,68 +171,139 @@ def get_best_gem_collection_path(
     if not gems:
         return None
 
-    # Compute forbidden positions for each step
-    def get_forbidden(step: int) -> set[Coords]:
-        forbidden = set(walls_pos.position for walls_pos in walls)
-        for enemy in enemies:
-            # Current position
-            forbidden.add(enemy.position)
-            # If initiative, add possible next positions
-            if not initiative:
-                # Example: add all adjacent positions (customize as needed)
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    next_pos = Coords(enemy.position.x + dx, enemy.position.y + dy)
-                    if 0 <= next_pos.x < width and 0 <= next_pos.y < height:
-                        forbidden.add(next_pos)
-        return forbidden
-
-    # Use passed-in caches if available, otherwise compute
-    if distance_matrix is not None and path_segments is not None:
+    # Use passed-in caches if they hold any paths; an empty matrix (no gems known
+    # yet) falls through to computing them here
+    if distance_matrix and path_segments:
         path_lengths = distance_matrix
         path_segs = path_segments
     else:
         positions = [bot_pos] + [gem.position for gem in gems]
+        targets = set(positions)
         path_lengths = {}
         path_segs = {}
+        # Enemy tiles make this grid unique per tick, so the shared path cache would
+        # never hit. Walls, enemies and, without initiative, the enemies' next moves
+        # are written straight into the occupancy grid with no forbidden set in between
+        grid = build_wall_grid((wall.position for wall in walls), width, height)
+        offsets = _ENEMY_TILE if initiative else _ENEMY_REACH
+        for enemy in enemies:
+            ex, ey = enemy.position.x, enemy.position.y
+            for dx, dy in offsets:
+                x, y = ex + dx, ey + dy
+                if 0 <= x < width and 0 <= y < height:
+                    grid[x * height + y] = 1
+        # One BFS per source reaches every other position, and the neighbor table is
+        # shared by all of them
+        neighbors = build_neighbor_table(grid, width, height)
+        # Every gem has to be collected, so one gem outside the bot's region means
+        # no tour exists; checking labels up front spares BFS runs that would
+        # exhaust the region looking for it. A bot standing on a blocked tile has
+        # no label of its own and skips the check
+        labels = label_components(grid, neighbors)
+        bot_label = labels[bot_pos.x * height + bot_pos.y]
+        if bot_label >= 0 and any(
+            not (0 <= pos.x < width and 0 <= pos.y < height)
+            or labels[pos.x * height + pos.y] != bot_label
+            for pos in positions
+        ):
+            return None
         for i, src in enumerate(positions):
+            # Blocked targets are never entered, so they stay unreachable as goals
+            paths = bfs_paths(src, targets, grid, width, height, neighbors)
             for j, dst in enumerate(positions):
                 if i != j:
-                    seg = cached_find_path(src, dst, get_forbidden(0), width, height)
+                    seg = paths.get(dst, [])
                     path_segs[(src, dst)] = seg
                     path_lengths[(src, dst)] = len(seg) if seg else float("inf")
 
-    best_path = None
-    max_total_remaining_ttl = -float("inf")
-
-    for perm in itertools.permutations(gems):
-        path = []
-        current_pos = bot_pos
-        valid = True
-        steps = 0
-        total_remaining_ttl = 0
-        for gem in perm:
-            seg = path_segments.get((current_pos, gem.position), [])  # type: ignore
-            seg_len = path_lengths.get((current_pos, gem.position), float("inf"))
-            if seg_len == float("inf"):
-                valid = False
-                break
-            if path:
-                seg = seg[1:]
-            path += seg
-            steps += seg_len
-            remaining_ttl = gem.ttl - steps
-            if remaining_ttl < 0:
-                valid = False
-                break
-            total_remaining_ttl += remaining_ttl
-            current_pos = gem.position
-        if valid and total_remaining_ttl > max_total_remaining_ttl:
-            max_total_remaining_ttl = total_remaining_ttl
-            best_path = path
+    # Held-Karp style DP over (visited mask, last gem). The score sums each gem's
+    # remaining TTL at arrival, so the step count matters beyond the best score: each
+    # state keeps the Pareto front of (steps, total) labels rather than one value
+    inf = float("inf")
+    positions = [gem.position for gem in gems]
+    n = len(gems)
+    # Pair lengths are copied into lists indexed by gem once, so the DP below works
+    # on gem ids and never hashes a Coords pair
+    ttls = [gem.ttl for gem in gems]
+    start = [path_lengths.get((bot_pos, pos), inf) for pos in positions]
+    dist = [
+        [path_lengths.get((src, dst), inf) for dst in positions] for src in positions
+    ]
+    # slack[i][k]: latest step at gem i that still lets gem k be reached on time;
+    # a pair without an entry gives no bound
+    slack = [
+        [ttls[k] - path_lengths.get((src, dst), 0) for k, dst in enumerate(positions)]
+        for src in positions
+    ]
+
+    def latest_arrival(mask: int, last: int) -> float:
+        # Bound for branch-and-bound: any detour to a later gem is at least as long
+        # as its direct segment, so arriving after this step dooms some unvisited gem
+        limit = ttls[last]
+        row = slack[last]
+        for k in range(n):
+            if not mask >> k & 1 and row[k] < limit:
+                limit = row[k]
+        return limit
+
+    layer: dict[tuple[int, int], list[tuple]] = {}
+    for i in range(n):
+        steps = start[i]
+        if steps <= latest_arrival(1 << i, i):
+            layer[(1 << i, i)] = [(steps, ttls[i] - steps, None, i)]
+    # Every transition adds one gem, so states are processed one visit count at a time
+    for _ in range(n - 1):
+        next_layer: dict[tuple[int, int], list[tuple]] = {}
+        for (mask, last), front in layer.items():
+            row = dist[last]
+            for nxt in range(n):
+                if mask >> nxt & 1:
+                    continue
+                seg_len = row[nxt]
+                if seg_len == inf:
+                    continue
+                ttl = ttls[nxt]
+                state = (mask | 1 << nxt, nxt)
+                limit = latest_arrival(*state)
+                labels = next_layer.setdefault(state, [])
+                for label in front:
+                    steps = label[0] + seg_len
+                    if steps <= limit:
+                        _add_pareto_label(
+                            labels, (steps, label[1] + ttl - steps, label, nxt)
+                        )
+        layer = next_layer
+
+    best = None
+    for front in layer.values():
+        for label in front:
+            if best is None or label[1] > best[1]:
+                best = label
+    if best is None:
+        return None
 
+    order = []
+    while best is not None:
+        order.append(positions[best[3]])
+        best = best[2]
+    order.reverse()
+    best_path = list(path_segs.get((bot_pos, order[0]), []))
+    for src, dst in zip(order, order[1:]):
+        best_path += path_segs.get((src, dst), [])[1:]
     return best_path
 
 
+def _add_pareto_label(labels: list[tuple], label: tuple) -> None:
+    """Insert a (steps, total, ...) label unless another label has fewer or equal steps
+    and an equal or higher total, dropping the labels it dominates in turn."""
+    steps, total = label[0], label[1]
+    for other in labels:
+        if other[0] <= steps and other[1] >= total:
+            return
+    labels[:] = [o for o in labels if not (steps <= o[0] and total >= o[1])]
+    labels.append(label)
+
+
 @lru_cache(maxsize=None)
 def get_adjacents(pos: Coords) -> set[Coords]:
     """Return adjacent coordinates within bounds."""
@@ -222,23 +321,17 @@ def get_diagonal_adjacents(pos: Coords) -> set[Coords]:
     }
 
 
-@lru_cache(maxsize=None)
-def _cached_get_adjacent_floors(
-    pos: Coords,
-    known_floors: frozenset[Coords],
-    width: int,
-    height: int,
-) -> set[Coords]:
-    """Cached version of get_adjacent_floors."""
-    adjacents = get_adjacents(pos, width, height)
-    return {adj for adj in adjacents if adj in known_floors}
-
-
 def get_adjacent_floors(
     pos: Coords,
     known_floors: set[Coords],
     width: int,
     height: int,
 ) -> set[Coords]:
-    """Wrapper for get_adjacent_floors with caching."""
-    return _cached_get_adjacent_floors(pos, frozenset(known_floors), width, height)
+    """Return the in-bounds neighbors of pos that are known floors."""
+    # Four set probes are already O(1); keying a cache on a frozenset copy of the
+    # floors cost O(floors) per call and never hit once the map changed
+    return {
+        adj
+        for adj in get_adjacents(pos)
+        if 0 <= adj.x < width and 0 <= adj.y < height and adj in known_floors
+    }
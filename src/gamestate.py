@@ -1,25 +1,30 @@
 import src.random_seed  # noqa: F401  # Sets global random seed as a side effect # isort: skip
+import heapq
 import random
 import sys
 from collections import deque
+from collections.abc import KeysView
 from dataclasses import dataclass, field
-from functools import cached_property
+from functools import cached_property, lru_cache
 
 from src.bot_logic import (
     check_reachable_gem,
     find_viewpoints,
     get_adjacents,
-    get_bot_enemy_2_gem_distances,
     get_diagonal_adjacents,
 )
 from src.debug import HighlightCoords, highlight_coords
 from src.graph import find_articulation_points, find_bridges, find_dead_ends_and_rooms
-from src.pathfinding import cached_find_path
+from src.pathfinding import (
+    bfs_paths,
+    build_neighbor_table,
+    build_wall_grid,
+    cached_find_path,
+)
 from src.schemas import (
     BehaviourState,
     Coords,
     EnemyBot,
-    Floor,
     GameConfig,
     Gem,
     ViewPoint,
@@ -32,44 +37,68 @@ class GameState:
     tick: int
     bot: Coords
     wall: set[Wall]
-    floor: set[Floor]
+    # Visible floor positions -> tick seen
+    floor: dict[Coords, int]
     initiative: bool
     visible_gems: list[Gem]
     visible_bots: list[EnemyBot]
     config: GameConfig
+    visible_bot_positions: frozenset[Coords] = field(default_factory=frozenset)
+    wall_positions: set[Coords] = field(default_factory=set)
+    wall_cache: dict[tuple[int, int], Wall] = field(default_factory=dict)
+    last_raw_walls: list | None = None
     known_gems: dict[Coords, Gem] = field(default_factory=dict)
     known_walls: dict[Coords, Wall] = field(default_factory=dict)
-    known_floors: dict[Coords, Floor] = field(default_factory=dict)
-    last_known_floor_positions: set[Coords] = field(default_factory=set)
+    known_wall_set: frozenset[Coords] = field(default_factory=frozenset)
+    known_wall_set_size: int = field(default=-1)
+    # Every floor seen so far -> tick it was last seen
+    known_floors: dict[Coords, int] = field(default_factory=dict)
+    known_floor_bits: int = field(default=0)
+    known_floor_bits_size: int = field(default=-1)
     distance_matrix: dict = field(default_factory=dict)
     path_segments: dict = field(default_factory=dict)
+    # Endpoint -> distance_matrix keys that contain it
+    matrix_keys_by_endpoint: dict[Coords, set[tuple[Coords, Coords]]] = field(
+        default_factory=dict
+    )
+    # Known wall count the matrix was computed with; a new wall can lengthen any path
+    distance_matrix_walls: int = field(default=-1)
     last_gem_positions: set[Coords] = field(default_factory=set)
     last_bot_pos: Coords | None = None
     last_n_ticks_bot_positions: deque = field(default_factory=lambda: deque(maxlen=5))
     last_path: list[Coords] = field(default_factory=list)
     current_strategy: str = field(default="")
     debug_mode: bool = field(default=True)
-    recent_positions: list[Coords] = field(default_factory=list)
+    recent_positions: deque[Coords] = field(default_factory=deque)
     bot_very_stuck: bool = field(default=False)
     bot_adjacent_positions: set[Coords] = field(default_factory=set)
     bot_diagonal_positions: set[Coords] = field(default_factory=set)
     hidden_positions: set[Coords] = field(default_factory=set)
     cave_revealed: bool = field(default=False)
     visibility_map: dict[Coords, ViewPoint] = field(default_factory=dict)
+    visibility_bits: dict[Coords, tuple[ViewPoint, int]] = field(default_factory=dict)
     highlight_sink: list[HighlightCoords] | None = None
     patrol_points: set[Coords] = field(default_factory=set)
     behaviour_state: BehaviourState = field(default=BehaviourState.IDLE)
     last_behaviour_state: BehaviourState = field(default=BehaviourState.IDLE)
     floor_graph: dict[Coords, set[Coords]] = field(default_factory=dict)
-    last_floor_graph: dict[Coords, set[Coords]] = field(default_factory=dict)
+    # Node counts of floor_graph when the results below were computed; the graph only
+    # grows, so an unchanged count means they are still current
+    bottleneck_graph_size: int = field(default=-1)
+    dead_ends_graph_size: int = field(default=-1)
     graph_articulation_points: set[Coords] = field(default_factory=set)
     graph_bridges: set[tuple[Coords, Coords]] = field(default_factory=set)
     visibility_grid: list[list[bool]] = field(default_factory=list)
+    wall_grid: bytearray = field(default_factory=bytearray)
+    neighbor_table: list[tuple[int, ...]] = field(default_factory=list)
+    neighbor_table_walls: int = field(default=-1)
     dead_ends: set[Coords] = field(default_factory=set)
     gem_captured_tick: int = field(default=0)
     stuck_counter: int = field(default=0)
 
     def __post_init__(self):
+        if not self.wall_positions:
+            self.wall_positions = {wall.position for wall in self.wall}
         if self.config is not None:
             self.hidden_positions = self._init_hidden_positions()
         self.highlight_sink = highlight_coords
@@ -78,16 +107,10 @@ class GameState:
         self.update_known_walls()
         self.update_known_floors()
         # Initialize all positions as hidden except known floors/walls
-        hidden = []
-        for x in range(self.config.width):
-            for y in range(self.config.height):
-                pos = Coords(x, y)
-                if (
-                    pos not in self.known_wall_positions
-                    and pos not in self.known_floor_positions
-                ):
-                    hidden.append(pos)
-        return set(hidden)
+        hidden = set(_grid_positions(self.config.width, self.config.height))
+        hidden -= self.known_wall_positions
+        hidden -= self.known_floor_positions
+        return hidden
 
     @cached_property
     def center(self) -> Coords:
@@ -95,16 +118,21 @@ class GameState:
         return Coords(self.config.width // 2, self.config.height // 2)
 
     @property
-    def known_wall_positions(self) -> set[Coords]:
-        return set(self.known_walls.keys())
+    def known_wall_positions(self) -> frozenset[Coords]:
+        # Rebuilt only when a new wall shows up
+        if self.known_wall_set_size != len(self.known_walls):
+            self.known_wall_set = frozenset(self.known_walls)
+            self.known_wall_set_size = len(self.known_walls)
+        return self.known_wall_set
 
     @property
-    def known_floor_positions(self) -> set[Coords]:
-        return set(self.known_floors.keys())
+    def known_floor_positions(self) -> KeysView[Coords]:
+        # A live view of known_floors; copy it before mutating
+        return self.known_floors.keys()
 
     @property
-    def visible_floor_positions(self) -> set[Coords]:
-        return set(floor.position for floor in self.floor)
+    def visible_floor_positions(self) -> KeysView[Coords]:
+        return self.floor.keys()
 
     @property
     def gem_positions(self) -> set[Coords]:
@@ -132,15 +160,14 @@ class GameState:
         """
         Generate a 2D grid representing the visibility map.
         """
-        self.visibility_grid = [
-            [False for _ in range(self.config.width)] for _ in range(self.config.height)
-        ]
+        width = self.config.width
+        self.visibility_grid = [[False] * width for _ in range(self.config.height)]
         for wall in self.known_wall_positions:
             self.visibility_grid[wall.y][wall.x] = True
 
     def refresh_visibility_map(self):
         self.visibility_map[self.bot] = ViewPoint(
-            position=self.bot, visible_tiles={f.position for f in self.floor}
+            position=self.bot, visible_tiles=set(self.floor)
         )
 
     def update_patrol_points(self):
@@ -152,25 +179,31 @@ class GameState:
         )
 
         # Step 2: Ensure all known floors are covered without overriding dead end-focused points
-        uncovered_floors = self.known_floor_positions.copy()
+        uncovered_floors = self.get_known_floor_bits()
         for vp in best_viewpoints:
-            uncovered_floors -= self.visibility_map.get(
-                vp, ViewPoint(position=vp)
-            ).visible_tiles
-
-        while uncovered_floors:
-            # Find the viewpoint that covers the most uncovered floors, but avoid overriding dead end-focused points
-            best_additional_viewpoint = max(
-                self.visibility_map.keys() - best_viewpoints,
-                key=lambda vp: len(
-                    self.visibility_map.get(vp, ViewPoint(position=vp)).visible_tiles
-                    & uncovered_floors
-                ),
-            )
-            best_viewpoints.add(best_additional_viewpoint)
-            uncovered_floors -= self.visibility_map.get(
-                best_additional_viewpoint, ViewPoint(position=best_additional_viewpoint)
-            ).visible_tiles
+            if vp in self.visibility_map:
+                uncovered_floors &= ~self.get_visibility_bits(vp)
+
+        # Lazy greedy cover of the rest: gains only shrink, so a popped entry is
+        # re-checked and pushed back if stale. Ties go to the earliest candidate
+        candidates = list(self.visibility_map.keys() - best_viewpoints)
+        tiles = [self.get_visibility_bits(vp) for vp in candidates]
+        heap = [
+            (-(visible & uncovered_floors).bit_count(), i)
+            for i, visible in enumerate(tiles)
+        ]
+        heapq.heapify(heap)
+
+        while uncovered_floors and heap:
+            neg_gain, i = heapq.heappop(heap)
+            gain = (tiles[i] & uncovered_floors).bit_count()
+            if gain != -neg_gain:
+                heapq.heappush(heap, (-gain, i))
+                continue
+            if gain == 0:
+                break  # The remaining floors are not visible from any viewpoint
+            best_viewpoints.add(candidates[i])
+            uncovered_floors &= ~tiles[i]
 
         # Update patrol points and highlight them
         self.patrol_points = best_viewpoints
@@ -186,44 +219,56 @@ class GameState:
                 del self.known_gems[pos]
         # Update with currently visible gems (resetting TTL if seen again)
         self.known_gems.update({gem.position: gem for gem in self.visible_gems})
+        # Keep the gem distance matrix that tsm_evaluator routes with in step with
+        # this tick's gems and bot position
+        self.recalculate_distance_matrix()
+        bx, by = self.bot.x, self.bot.y
+        enemy_xy = [(enemy.position.x, enemy.position.y) for enemy in self.visible_bots]
+        walls = self.known_wall_positions
+        width, height = self.config.width, self.config.height
         for gem in self.known_gems.values():
+            gx, gy = gem.position.x, gem.position.y
+            gem.distance2bot = abs(gx - bx) + abs(gy - by)
+            # Known gems outlive the tick they were seen in, so the list is replaced
+            # rather than extended, or it would keep growing with stale distances
+            gem.distance2enemies = [abs(gx - ex) + abs(gy - ey) for ex, ey in enemy_xy]
             gem.reachable = check_reachable_gem(
                 self.bot,
                 gem,
-                self.known_wall_positions,
-                self.config.width,
-                self.config.height,
+                walls,
+                width,
+                height,
+                distance_matrix=self.distance_matrix,
             )
         self.known_gems.pop(self.bot, None)
 
     def update_floor_graph(self):
         """
-        Incrementally update the floor graph when new floors are added or removed.
+        Incrementally update the floor graph when new floors are added.
         """
-        current_floors = self.known_floor_positions
-        if current_floors == self.last_known_floor_positions:
-            return  # No change, skip update
-
-        # Remove nodes for floors that disappeared
-        removed = self.last_known_floor_positions - current_floors
-        for floor in removed:
-            self.floor_graph.pop(floor, None)
-            for neighbors in self.floor_graph.values():
-                neighbors.discard(floor)
+        floor_graph = self.floor_graph
+        known_floors = self.known_floors
+        if len(floor_graph) == len(known_floors):
+            return  # Floors are only ever added, so an equal count means no change
+
+        # New floors can only come from this tick's view, so only those are checked;
+        # if they don't account for the growth, known_floors was filled another way
+        # and every known floor is checked instead
+        added = [
+            pos for pos in self.floor if pos not in floor_graph and pos in known_floors
+        ]
+        if len(floor_graph) + len(added) != len(known_floors):
+            added = [pos for pos in known_floors if pos not in floor_graph]
 
-        # Add nodes for new floors
-        added = current_floors - self.last_known_floor_positions
         for floor in added:
-            self.floor_graph[floor] = set()
+            neighbors = floor_graph[floor] = set()
             for neighbor in get_adjacents(floor):
-                if neighbor in self.floor_graph:
-                    self.floor_graph[floor].add(neighbor)
-                    self.floor_graph[neighbor].add(floor)
-
-        self.last_known_floor_positions = set(current_floors)
+                if neighbor in floor_graph:
+                    neighbors.add(neighbor)
+                    floor_graph[neighbor].add(floor)
 
     def update_bottleneck_info(self):
-        if self.floor_graph == self.last_floor_graph:
+        if self.bottleneck_graph_size == len(self.floor_graph):
             highlight_coords.append(
                 HighlightCoords(
                     "articulation_points",
@@ -234,6 +279,7 @@ class GameState:
             return  # No change, skip update
         self.graph_articulation_points = find_articulation_points(self.floor_graph)
         self.graph_bridges = find_bridges(self.floor_graph)
+        self.bottleneck_graph_size = len(self.floor_graph)
         if self.debug_mode:
             highlight_coords.append(
                 HighlightCoords(
@@ -244,26 +290,60 @@ class GameState:
             )
 
     def update_dead_ends_and_rooms(self):
-        if self.floor_graph == self.last_floor_graph:
+        if self.dead_ends_graph_size == len(self.floor_graph):
             highlight_coords.append(
                 HighlightCoords("dead_ends", list(self.dead_ends), "#ff00ff")
             )
             return  # No change, skip update
         self.dead_ends = find_dead_ends_and_rooms(self.floor_graph)
+        self.dead_ends_graph_size = len(self.floor_graph)
         highlight_coords.append(
             HighlightCoords("dead_ends", list(self.dead_ends), "#ff00ff")
         )
 
     def update_known_walls(self):
+        height = self.config.height
+        if len(self.wall_grid) != self.config.width * height:
+            self.wall_grid = build_wall_grid(
+                self.known_walls.keys(), self.config.width, height
+            )
+        # Walls only ever get added, so the grid is patched in place across ticks
         for wall in self.wall:
             self.known_walls[wall.position] = wall
+            self.wall_grid[wall.position.x * height + wall.position.y] = 1
 
     def update_known_floors(self):
-        for floor in self.floor:
-            self.known_floors[floor.position] = floor
+        known_floors = self.known_floors
+        in_sync = self.known_floor_bits_size == len(known_floors)
+        known_floors.update(self.floor)
+        # A known_floors replaced from outside is left to get_known_floor_bits
+        if in_sync:
+            self.known_floor_bits |= _position_bits(self.floor, self.config.height)
+            self.known_floor_bits_size = len(known_floors)
+
+    def get_known_floor_bits(self) -> int:
+        if self.known_floor_bits_size != len(self.known_floors):
+            self.known_floor_bits = _position_bits(
+                self.known_floors, self.config.height
+            )
+            self.known_floor_bits_size = len(self.known_floors)
+        return self.known_floor_bits
+
+    def get_visibility_bits(self, vp: Coords) -> int:
+        # ViewPoints are replaced, never mutated, so a different object means stale
+        viewpoint = self.visibility_map[vp]
+        cached = self.visibility_bits.get(vp)
+        if cached is None or cached[0] is not viewpoint:
+            cached = (
+                viewpoint,
+                _position_bits(viewpoint.visible_tiles, self.config.height),
+            )
+            self.visibility_bits[vp] = cached
+        return cached[1]
 
     def update_hidden_positions(self):
-        self.hidden_positions -= self.known_floor_positions | self.known_wall_positions
+        self.hidden_positions -= self.known_floor_positions
+        self.hidden_positions -= self.known_wall_positions
 
     def update_bot_adjacent_positions(self):
         self.bot_adjacent_positions = get_adjacents(self.bot)
@@ -272,9 +352,10 @@ class GameState:
         self.bot_diagonal_positions = get_diagonal_adjacents(self.bot)
 
     def update_recent_positions(self, limit: int):
+        # Plain lists assigned from outside are converted on the first update
+        if getattr(self.recent_positions, "maxlen", None) != limit:
+            self.recent_positions = deque(self.recent_positions, maxlen=limit)
         self.recent_positions.append(self.bot)
-        if len(self.recent_positions) > limit:
-            self.recent_positions.pop(0)
 
     def update_hidden_floors(self) -> list[Coords]:
         width, height = self.config.width, self.config.height
@@ -298,15 +379,20 @@ class GameState:
             print("[GameState] Cave fully revealed.", file=sys.stderr)
         return hidden
 
-    def recalculate_gem_distances(self):
-        for pos, gem in list(self.known_gems.items()):
-            self.known_gems[pos] = get_bot_enemy_2_gem_distances(
-                self.bot, self.visible_bots, gem
-            )
-
     def recalculate_distance_matrix(self):
+        if self.distance_matrix_walls != len(self.known_walls):
+            # Every stored path may now cross a wall, so start over from no gems
+            self.distance_matrix = {}
+            self.path_segments = {}
+            self.matrix_keys_by_endpoint = {}
+            self.last_gem_positions = set()
+            self.distance_matrix_walls = len(self.known_walls)
         bot_pos = self.bot
         gem_positions = self.gem_positions
+        # Drop the rows of the tile the bot left, unless a gem sits there
+        previous_bot = self.last_bot_pos
+        if previous_bot != bot_pos and previous_bot not in gem_positions:
+            self._drop_matrix_endpoint(previous_bot)
         # Only recalculate changed paths
         if self.last_gem_positions != gem_positions:
             if self.debug_mode:
@@ -314,142 +400,114 @@ class GameState:
                     "[GameState] Updating changed gem positions in distance matrix and path segments",
                     file=sys.stderr,
                 )
+            previous_gems = self.last_gem_positions
+            width, height = self.config.width, self.config.height
             # Remove paths for gems that disappeared
-            removed_gems = (
-                self.last_gem_positions - gem_positions
-                if self.last_gem_positions
-                else set()
-            )
-            for gem_pos in removed_gems:
-                keys_to_remove = [
-                    k for k in self.distance_matrix.keys() if gem_pos in k
-                ]
-                for k in keys_to_remove:
-                    self.distance_matrix.pop(k, None)
-                    self.path_segments.pop(k, None)
-            # Add/update paths for new gems
-            new_gems = (
-                gem_positions - self.last_gem_positions
-                if self.last_gem_positions
-                else gem_positions
-            )
-            all_positions = [bot_pos] + list(new_gems)
-            for src in all_positions:
-                for dst in all_positions:
-                    if src != dst:
-                        seg = get_pre_filled_cached_path(
-                            start=src,
-                            target=dst,
-                            forbidden=self.known_wall_positions,
-                            game_state=self,
-                        )
-                        self.path_segments[(src, dst)] = seg
-                        self.distance_matrix[(src, dst)] = (
-                            len(seg) if seg else float("inf")
-                        )
-            self.last_gem_positions = set(gem_positions)
+            for gem_pos in previous_gems - gem_positions:
+                self._drop_matrix_endpoint(gem_pos)
+            # Only new gems need a search: one BFS reaches the bot and every other
+            # gem, and the reversed path serves the opposite direction
+            others = gem_positions | {bot_pos}
+            neighbors = self.get_neighbor_table()
+            for gem_pos in gem_positions - previous_gems:
+                paths = bfs_paths(
+                    gem_pos, others, self.wall_grid, width, height, neighbors
+                )
+                for other in others:
+                    if other != gem_pos:
+                        seg = paths.get(other, [])
+                        self._set_path_segment(gem_pos, other, seg)
+                        self._set_path_segment(other, gem_pos, seg[::-1])
+            # Gems that were already known keep their rows, except the bot row
+            kept_gems = gem_positions & previous_gems
+            if kept_gems:
+                paths = bfs_paths(
+                    bot_pos, kept_gems, self.wall_grid, width, height, neighbors
+                )
+                for gem_pos in kept_gems:
+                    self._set_path_segment(bot_pos, gem_pos, paths.get(gem_pos, []))
+            # gem_positions is a fresh set per access, so it can be kept without a copy
+            self.last_gem_positions = gem_positions
             self.last_bot_pos = bot_pos
         elif self.last_gem_positions and self.last_bot_pos != bot_pos:
             if self.debug_mode:
                 print("[GameState] Updating bot-to-gem distances", file=sys.stderr)
+            paths = bfs_paths(
+                bot_pos,
+                gem_positions,
+                self.wall_grid,
+                self.config.width,
+                self.config.height,
+                self.get_neighbor_table(),
+            )
             for gem_pos in gem_positions:
-                seg = get_pre_filled_cached_path(
-                    start=bot_pos,
-                    forbidden=self.known_wall_positions,
-                    target=gem_pos,
-                    game_state=self,
-                )
-                self.path_segments[(bot_pos, gem_pos)] = seg
-                self.distance_matrix[(bot_pos, gem_pos)] = (
-                    len(seg) if seg else float("inf")
-                )
+                self._set_path_segment(bot_pos, gem_pos, paths.get(gem_pos, []))
             self.last_bot_pos = bot_pos
 
-    @classmethod
-    def from_dict(cls, data: dict, config: GameConfig) -> "GameState":
-        required_keys = ["tick", "bot", "wall", "floor", "initiative", "visible_gems"]
-        for key in required_keys:
-            if key not in data:
-                raise ValueError(f"Missing required key in data: {key}")
-        if not isinstance(data["bot"], (list, tuple)) or len(data["bot"]) != 2:
-            raise ValueError("'bot' must be a list or tuple of length 2")
-        bot = Coords(x=data["bot"][0], y=data["bot"][1])
-        wall = {Wall(position=Coords(x=w[0], y=w[1])) for w in data["wall"]}
-        floor = {
-            Floor(position=Coords(x=f[0], y=f[1]), last_seen=data["tick"])
-            for f in data["floor"]
-        }
-        visible_gems = []
-        for g in data["visible_gems"]:
-            if "position" not in g or "ttl" not in g:
-                raise ValueError("Each gem must have 'position' and 'ttl'")
-            if not isinstance(g["position"], (list, tuple)) or len(g["position"]) != 2:
-                raise ValueError("Gem 'position' must be a list or tuple of length 2")
-            visible_gems.append(
-                Gem(
-                    position=Coords(x=g["position"][0], y=g["position"][1]),
-                    ttl=g["ttl"],
-                    distance2bot=g.get("distance2bot"),
-                    distance2enemies=g.get("distance2enemies", []),
-                    reachable=g.get("reachable", False),
-                )
+    def get_neighbor_table(self) -> list[tuple[int, ...]]:
+        # Walls are only ever added, so the wall count tells whether the table is stale
+        if self.neighbor_table_walls != len(self.known_walls):
+            self.neighbor_table = build_neighbor_table(
+                self.wall_grid, self.config.width, self.config.height
             )
-        visible_bots = [
-            EnemyBot(position=Coords(x=b["position"][0], y=b["position"][1]))
-            for b in data.get("visible_bots", [])
-            if "position" in b
-            and isinstance(b["position"], (list, tuple))
-            and len(b["position"]) == 2
-        ]
+            self.neighbor_table_walls = len(self.known_walls)
+        return self.neighbor_table
+
+    def _set_path_segment(self, src: Coords, dst: Coords, seg: list[Coords]):
+        key = (src, dst)
+        self.path_segments[key] = seg
+        self.distance_matrix[key] = len(seg) if seg else float("inf")
+        keys_by_endpoint = self.matrix_keys_by_endpoint
+        keys_by_endpoint.setdefault(src, set()).add(key)
+        keys_by_endpoint.setdefault(dst, set()).add(key)
+
+    def _drop_matrix_endpoint(self, pos: Coords | None):
+        keys_by_endpoint = self.matrix_keys_by_endpoint
+        for key in keys_by_endpoint.pop(pos, ()):
+            self.distance_matrix.pop(key, None)
+            self.path_segments.pop(key, None)
+            other = key[1] if key[0] == pos else key[0]
+            if other in keys_by_endpoint:
+                keys_by_endpoint[other].discard(key)
 
+    @classmethod
+    def from_dict(cls, data: dict, config: GameConfig) -> "GameState":
+        bot = _parse_frame_bot(data)
+        wall_positions = set(map(Coords._make, data["wall"]))
+        wall = {Wall(position=pos) for pos in wall_positions}
         return cls(
             tick=data["tick"],
             bot=bot,
             wall=wall,
-            floor=floor,
+            wall_positions=wall_positions,
+            floor=_parse_floor(data["floor"], data["tick"]),
             initiative=data["initiative"],
-            visible_gems=visible_gems,
-            visible_bots=visible_bots,
+            visible_gems=_parse_gems(data["visible_gems"]),
+            visible_bots=_parse_bots(data.get("visible_bots", [])),
             config=config,
         )
 
     def update_from_dict(self, data: dict):
-        required_keys = ["tick", "bot", "wall", "floor", "initiative", "visible_gems"]
-        for key in required_keys:
-            if key not in data:
-                raise ValueError(f"Missing required key in data: {key}")
-        if not isinstance(data["bot"], (list, tuple)) or len(data["bot"]) != 2:
-            raise ValueError("'bot' must be a list or tuple of length 2")
+        self.bot = _parse_frame_bot(data)
         self.tick = data["tick"]
-        self.bot = Coords(x=data["bot"][0], y=data["bot"][1])
-        self.wall = {Wall(position=Coords(x=w[0], y=w[1])) for w in data["wall"]}
-        self.floor = {
-            Floor(position=Coords(x=f[0], y=f[1]), last_seen=self.tick)
-            for f in data["floor"]
-        }
+        raw_walls = data["wall"]
+        # Walls never move, so an unchanged list keeps last tick's sets
+        if raw_walls != self.last_raw_walls:
+            wall_cache = self.wall_cache
+            walls = set()
+            for w in raw_walls:
+                key = (w[0], w[1])
+                wall = wall_cache.get(key)
+                if wall is None:
+                    wall = wall_cache[key] = Wall(position=Coords(x=w[0], y=w[1]))
+                walls.add(wall)
+            self.wall = walls
+            self.wall_positions = {wall.position for wall in walls}
+            self.last_raw_walls = raw_walls
+        self.floor = _parse_floor(data["floor"], self.tick)
         self.initiative = data["initiative"]
-        self.visible_gems = []
-        for g in data["visible_gems"]:
-            if "position" not in g or "ttl" not in g:
-                raise ValueError("Each gem must have 'position' and 'ttl'")
-            if not isinstance(g["position"], (list, tuple)) or len(g["position"]) != 2:
-                raise ValueError("Gem 'position' must be a list or tuple of length 2")
-            self.visible_gems.append(
-                Gem(
-                    position=Coords(x=g["position"][0], y=g["position"][1]),
-                    ttl=g["ttl"],
-                    distance2bot=g.get("distance2bot"),
-                    distance2enemies=g.get("distance2enemies", []),
-                    reachable=g.get("reachable", False),
-                )
-            )
-        self.visible_bots = [
-            EnemyBot(position=Coords(x=b["position"][0], y=b["position"][1]))
-            for b in data.get("visible_bots", [])
-            if "position" in b
-            and isinstance(b["position"], (list, tuple))
-            and len(b["position"]) == 2
-        ]
+        self.visible_gems = _parse_gems(data["visible_gems"])
+        self.visible_bots = _parse_bots(data.get("visible_bots", []))
 
     def refresh_patrol_data(self):
         """
@@ -463,6 +521,9 @@ class GameState:
         self.update_dead_ends_and_rooms()
 
     def refresh(self):
+        self.visible_bot_positions = frozenset(
+            bot.position for bot in self.visible_bots
+        )
         self.refresh_visibility_map()
         self.update_bot_adjacent_positions()
         self.update_bot_diagonal_adjacent_positions()
@@ -477,12 +538,73 @@ class GameState:
         # else:
         self.refresh_patrol_data()
         self.update_known_gems()
-        self.recalculate_gem_distances()
         self.last_bot_pos = self.bot
         self.last_n_ticks_bot_positions.append(self.bot)
         self.last_behaviour_state = self.behaviour_state
 
 
+def _position_bits(positions, height: int) -> int:
+    """Pack positions into an int bitset, one bit per flat x * height + y index."""
+    bits = 0
+    for pos in positions:
+        bits |= 1 << (pos.x * height + pos.y)
+    return bits
+
+
+_FRAME_KEYS = ("tick", "bot", "wall", "floor", "initiative", "visible_gems")
+
+
+def _parse_frame_bot(data: dict) -> Coords:
+    """Check that a tick payload has every required key and return the bot position."""
+    for key in _FRAME_KEYS:
+        if key not in data:
+            raise ValueError(f"Missing required key in data: {key}")
+    bot = data["bot"]
+    if not isinstance(bot, (list, tuple)) or len(bot) != 2:
+        raise ValueError("'bot' must be a list or tuple of length 2")
+    return Coords(bot[0], bot[1])
+
+
+def _parse_floor(raw_floor: list, tick: int) -> dict[Coords, int]:
+    return dict.fromkeys(map(Coords._make, raw_floor), tick)
+
+
+def _parse_gems(raw_gems: list) -> list[Gem]:
+    gems = []
+    for g in raw_gems:
+        if "position" not in g or "ttl" not in g:
+            raise ValueError("Each gem must have 'position' and 'ttl'")
+        position = g["position"]
+        if not isinstance(position, (list, tuple)) or len(position) != 2:
+            raise ValueError("Gem 'position' must be a list or tuple of length 2")
+        gems.append(
+            Gem(
+                position=Coords(position[0], position[1]),
+                ttl=g["ttl"],
+                distance2bot=g.get("distance2bot"),
+                distance2enemies=g.get("distance2enemies", []),
+                reachable=g.get("reachable", False),
+            )
+        )
+    return gems
+
+
+def _parse_bots(raw_bots: list) -> list[EnemyBot]:
+    return [
+        EnemyBot(position=Coords(b["position"][0], b["position"][1]))
+        for b in raw_bots
+        if "position" in b
+        and isinstance(b["position"], (list, tuple))
+        and len(b["position"]) == 2
+    ]
+
+
+@lru_cache(maxsize=1)
+def _grid_positions(width: int, height: int) -> frozenset[Coords]:
+    """Every position on a width x height map, shared by all states on that map."""
+    return frozenset(Coords(x, y) for x in range(width) for y in range(height))
+
+
 def get_pre_filled_cached_path(
     start: Coords,
     target: Coords,
@@ -495,11 +617,10 @@ def get_pre_filled_cached_path(
     if game_state.bot_very_stuck:
         # When the bot is very stuck, move away from the nearest enemy
         adjacents = list(get_adjacents(start))
-        enemy_positions = {bot.position for bot in game_state.visible_bots}
         allowed_moves = [
             pos
             for pos in adjacents
-            if pos not in forbidden and pos not in enemy_positions
+            if pos not in forbidden and pos not in game_state.visible_bot_positions
         ]
         if allowed_moves:
             target = random.choice(allowed_moves)
@@ -1,10 +1,20 @@
 import heapq
 import sys
 from collections import deque
-from typing import Callable
+from functools import lru_cache
+from typing import Callable, Iterable
 
 from src.schemas import Coords, Direction
 
+# Direction -> raw (dx, dy) so search loops avoid the enum/Coords attribute chain
+_DELTAS: dict[Direction, tuple[int, int]] = {
+    direction: (direction.value.x, direction.value.y) for direction in Direction
+}
+# Default move set for the searches, built once instead of per call
+_MOVE_DIRECTIONS: tuple[Direction, ...] = tuple(
+    d for d in Direction if d != Direction.WAIT
+)
+
 
 def cluster_targets(targets, max_distance):
     clusters = []
@@ -28,6 +38,95 @@ def manhattan(a: Coords, b: Coords) -> int:
     return abs(a.x - b.x) + abs(a.y - b.y)
 
 
+def build_wall_grid(forbidden: Iterable[Coords], width: int, height: int) -> bytearray:
+    """
+    Build a flat occupancy grid (index x * height + y, 1 = blocked).
+    The x-major layout keeps integer index order identical to Coords ordering.
+    """
+    grid = bytearray(width * height)
+    for pos in forbidden:
+        if 0 <= pos.x < width and 0 <= pos.y < height:
+            grid[pos.x * height + pos.y] = 1
+    return grid
+
+
+def indices_to_path(parents: list[int], goal: int, height: int) -> list[Coords]:
+    """
+    Walk a flat parent array back from goal to the search root (its own parent).
+    """
+    path = []
+    node = goal
+    while True:
+        path.append(Coords(node // height, node % height))
+        parent = parents[node]
+        if parent == node:
+            break
+        node = parent
+    path.reverse()
+    return path
+
+
+# (forbidden, width, height) and the grid bytes of the last frozenset build_padded_grid saw
+_last_padded_grid: list = [None, b""]
+
+
+def build_padded_grid(
+    forbidden: Iterable[Coords], width: int, height: int
+) -> bytearray:
+    """
+    Occupancy grid with a one-tile blocked border (index (x + 1) * (height + 2) + y + 1).
+    Every in-map neighbour step then lands inside the buffer, so searches test a
+    single byte instead of bounds plus wall.
+    """
+    key = (forbidden, width, height)
+    if isinstance(forbidden, frozenset) and _last_padded_grid[0] == key:
+        # Known walls are shared as one frozenset per wall count, so repeated searches
+        # against it copy the finished grid instead of re-hashing every wall
+        return bytearray(_last_padded_grid[1])
+    padded_height = height + 2
+    grid = bytearray(b"\x01" * padded_height)
+    row = b"\x01" + bytes(height) + b"\x01"
+    for _ in range(width):
+        grid += row
+    grid += b"\x01" * padded_height
+    for pos in forbidden:
+        if 0 <= pos.x < width and 0 <= pos.y < height:
+            grid[(pos.x + 1) * padded_height + pos.y + 1] = 1
+    if isinstance(forbidden, frozenset):
+        _last_padded_grid[:] = [key, bytes(grid)]
+    return grid
+
+
+def padded_indices_to_path(
+    parents: list[int], goal: int, padded_height: int
+) -> list[Coords]:
+    """
+    Walk a build_padded_grid parent array back from goal to the root (its own parent).
+    """
+    path = []
+    node = goal
+    while True:
+        x, y = divmod(node, padded_height)
+        path.append(Coords(x - 1, y - 1))
+        parent = parents[node]
+        if parent == node:
+            break
+        node = parent
+    path.reverse()
+    return path
+
+
+@lru_cache(maxsize=None)
+def _padded_steps(
+    directions: tuple[Direction, ...], padded_height: int
+) -> tuple[tuple[int, int, int], ...]:
+    """(dx, dy, index offset) per direction on a padded grid, built once per map height."""
+    return tuple(
+        (dx, dy, dx * padded_height + dy)
+        for dx, dy in (_DELTAS[direction] for direction in directions)
+    )
+
+
 def astar(
     start: Coords,
     goal: Coords,
@@ -37,39 +136,54 @@ def astar(
     directions: list[Direction] | None = None,
 ) -> list[Coords]:
     if directions is None:
-        directions = [d for d in Direction if d != Direction.WAIT]
+        directions = _MOVE_DIRECTIONS
+    if not (0 <= start.x < width and 0 <= start.y < height):
+        return [start] if start == goal else []
+    if not (0 <= goal.x < width and 0 <= goal.y < height):
+        return []
 
-    open_set = []
-    heapq.heappush(open_set, (0, start, [start]))
-    g_score = {start: 0}
-    visited = set()
+    # Nodes are padded grid indices; walls, the border and expanded nodes share one
+    # byte mask, so a neighbour needs a single test before the g-score check
+    padded_height = height + 2
+    closed = build_padded_grid(forbidden, width, height)
+    steps = _padded_steps(tuple(directions), padded_height)
+    start_idx = (start.x + 1) * padded_height + start.y + 1
+    goal_idx = (goal.x + 1) * padded_height + goal.y + 1
+    # Heuristic works in padded coordinates; the +1 offset cancels out
+    gx, gy = goal.x + 1, goal.y + 1
+    closed[start_idx] = 0
+    parents = [-1] * len(closed)
+    parents[start_idx] = start_idx
+    g_score = {start_idx: 0}
+    # Equal f-scores pop the deepest node first (-g), so on open ground the search
+    # runs along one of the many symmetric shortest paths instead of fanning out
+    open_set = [(0, 0, start_idx)]
 
     while open_set:
-        _, current, path = heapq.heappop(open_set)
-        if current == goal:
-            return path
-        visited.add(current)
-
-        for direction in directions:
-            ddx, ddy = direction.value.x, direction.value.y
-            neighbor = Coords(current.x + ddx, current.y + ddy)
-            if (
-                0 <= neighbor.x < width
-                and 0 <= neighbor.y < height
-                and neighbor not in forbidden
-                and neighbor not in visited
+        _, _, current = heapq.heappop(open_set)
+        if current == goal_idx:
+            return padded_indices_to_path(parents, current, padded_height)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        x, y = divmod(current, padded_height)
+        tentative_g = g_score[current] + 1
+
+        for dx, dy, step in steps:
+            neighbor = current + step
+            if not closed[neighbor] and tentative_g < g_score.get(
+                neighbor, tentative_g + 1
             ):
-                tentative_g = g_score[current] + 1
-                if tentative_g < g_score.get(neighbor, float("inf")):
-                    g_score[neighbor] = tentative_g
-                    f_score = tentative_g + manhattan(neighbor, goal)
-                    heapq.heappush(open_set, (f_score, neighbor, path + [neighbor]))
+                g_score[neighbor] = tentative_g
+                parents[neighbor] = current
+                f_score = tentative_g + abs(x + dx - gx) + abs(y + dy - gy)
+                heapq.heappush(open_set, (f_score, -tentative_g, neighbor))
     return []
 
 
 def bfs(
     start: Coords,
-    is_goal: Callable[[Coords, list[Coords]], bool],
+    is_goal: Callable[[Coords], bool],
     forbidden: set[Coords],
     width: int,
     height: int,
@@ -79,46 +193,200 @@ def bfs(
     """
     Generic BFS for grid pathfinding using Coords and Wall objects.
     Prioritizes movement along the axis with the greatest remaining distance to the goal.
+    Searches padded grid indices (see build_padded_grid) and rebuilds the path once a goal
+    is found, so only the goal predicate ever sees a Coords.
     """
-    queue = deque()
-    queue.append((start, [start]))
-    visited = set([start])
     if directions is None:
-        directions = [d for d in Direction if d != Direction.WAIT]
+        directions = _MOVE_DIRECTIONS
+    if not (0 <= start.x < width and 0 <= start.y < height):
+        return [start] if is_goal(start) else []
+
+    # One byte per tile marks it as forbidden, off-map border or already queued
+    padded_height = height + 2
+    blocked = build_padded_grid(forbidden, width, height)
+    steps = _padded_steps(tuple(directions), padded_height)
+    # Axis-prioritized orders are fixed per call, so build them once up front
+    x_first = [s for s in steps if s[0] != 0] + [s for s in steps if s[1] != 0]
+    y_first = [s for s in steps if s[1] != 0] + [s for s in steps if s[0] != 0]
+
+    start_idx = (start.x + 1) * padded_height + start.y + 1
+    blocked[start_idx] = 1
+    parents = [-1] * len(blocked)
+    parents[start_idx] = start_idx
+    queue = deque([start_idx])
 
     while queue:
-        current_pos, path = queue.popleft()
-        if is_goal(current_pos, path):
-            return path
+        current = queue.popleft()
+        x, y = divmod(current, padded_height)
+        x -= 1
+        y -= 1
+        if is_goal(Coords(x, y)):
+            return padded_indices_to_path(parents, current, padded_height)
 
         # Prioritize directions based on greatest axis distance to goal
         if goal is not None:
-            dx = abs(goal.x - current_pos.x)
-            dy = abs(goal.y - current_pos.y)
+            dx = abs(goal.x - x)
+            dy = abs(goal.y - y)
             if dx > dy:
-                prioritized = [d for d in directions if d.value.x != 0] + [
-                    d for d in directions if d.value.y != 0
-                ]
+                prioritized = x_first
             elif dy > dx:
-                prioritized = [d for d in directions if d.value.y != 0] + [
-                    d for d in directions if d.value.x != 0
-                ]
+                prioritized = y_first
             else:
-                prioritized = directions
+                prioritized = steps
         else:
-            prioritized = directions
-
-        for direction in prioritized:
-            ddx, ddy = direction.value.x, direction.value.y
-            neighbor = Coords(current_pos.x + ddx, current_pos.y + ddy)
-            if (
-                0 <= neighbor.x < width
-                and 0 <= neighbor.y < height
-                and neighbor not in forbidden
-                and neighbor not in visited
-            ):
-                visited.add(neighbor)
-                queue.append((neighbor, path + [neighbor]))
+            prioritized = steps
+
+        for _, _, step in prioritized:
+            neighbor = current + step
+            if not blocked[neighbor]:
+                blocked[neighbor] = 1
+                parents[neighbor] = current
+                queue.append(neighbor)
+    return []
+
+
+def build_neighbor_table(
+    wall_grid: bytes | bytearray, width: int, height: int
+) -> list[tuple[int, ...]]:
+    """
+    Open 4-neighbours of every tile, indexed like build_wall_grid.
+    Bounds and wall checks are paid once here, so BFS kernels that share a wall
+    grid only walk precomputed tuples.
+    """
+    last_x = (width - 1) * height
+    last_y = height - 1
+    table = []
+    for current in range(width * height):
+        y = current % height
+        table.append(
+            tuple(
+                neighbor
+                for neighbor, inside in (
+                    (current - height, current >= height),
+                    (current + height, current < last_x),
+                    (current - 1, y > 0),
+                    (current + 1, y < last_y),
+                )
+                if inside and not wall_grid[neighbor]
+            )
+        )
+    return table
+
+
+def label_components(
+    wall_grid: bytes | bytearray, neighbors: list[tuple[int, ...]]
+) -> list[int]:
+    """
+    Connected-component id per flat grid index (-1 for walls), via one flood fill
+    per component over a build_neighbor_table table. Two tiles with different ids
+    have no path between them, so callers can skip the search entirely.
+    """
+    labels = [-1] * len(neighbors)
+    label = 0
+    for root in range(len(neighbors)):
+        if labels[root] >= 0 or wall_grid[root]:
+            continue
+        labels[root] = label
+        stack = [root]
+        while stack:
+            for neighbor in neighbors[stack.pop()]:
+                if labels[neighbor] < 0:
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+        label += 1
+    return labels
+
+
+def _bfs_grid_parents(
+    start: int,
+    goals: set[int],
+    neighbors: list[tuple[int, ...]],
+) -> list[int]:
+    """
+    BFS kernel over flat grid indices and a build_neighbor_table table.
+    Returns the parent array (-1 = unvisited, root is its own parent) and stops
+    once every goal index has been reached.
+    """
+    parents = [-1] * len(neighbors)
+    parents[start] = start
+    remaining = goals - {start}
+    queue = deque([start])
+
+    while queue and remaining:
+        current = queue.popleft()
+        for neighbor in neighbors[current]:
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                remaining.discard(neighbor)
+                queue.append(neighbor)
+    return parents
+
+
+def bfs_paths(
+    start: Coords,
+    targets: set[Coords],
+    wall_grid: bytes | bytearray,
+    width: int,
+    height: int,
+    neighbors: list[tuple[int, ...]] | None = None,
+) -> dict[Coords, list[Coords]]:
+    """
+    Single BFS from start returning shortest paths to all reachable targets.
+    The search stops as soon as every target has been reached, so one traversal
+    replaces a separate find_path call per (start, target) pair. Blocked tiles
+    are read from a grid built by build_wall_grid instead of hashing into a set.
+    Pass a neighbor table built from the same grid to reuse it across calls.
+    """
+    if neighbors is None:
+        neighbors = build_neighbor_table(wall_grid, width, height)
+    goals = {
+        target.x * height + target.y: target
+        for target in targets
+        if 0 <= target.x < width and 0 <= target.y < height
+    }
+    parents = _bfs_grid_parents(start.x * height + start.y, set(goals), neighbors)
+    return {
+        target: indices_to_path(parents, idx, height)
+        for idx, target in goals.items()
+        if parents[idx] >= 0
+    }
+
+
+def bfs_nearest(
+    start: Coords,
+    targets: set[Coords],
+    wall_grid: bytes | bytearray,
+    width: int,
+    height: int,
+    neighbors: list[tuple[int, ...]] | None = None,
+) -> list[Coords]:
+    """
+    Shortest path from start to whichever target is reached first.
+    Equivalent to bfs with a set-membership goal, but targets are marked in a byte
+    mask and the queue walks a build_neighbor_table table, so no Coords is built
+    or hashed per expanded tile.
+    """
+    if not (0 <= start.x < width and 0 <= start.y < height):
+        return [start] if start in targets else []
+    if neighbors is None:
+        neighbors = build_neighbor_table(wall_grid, width, height)
+    goal_mask = bytearray(width * height)
+    for target in targets:
+        if 0 <= target.x < width and 0 <= target.y < height:
+            goal_mask[target.x * height + target.y] = 1
+    start_idx = start.x * height + start.y
+    parents = [-1] * len(neighbors)
+    parents[start_idx] = start_idx
+    queue = deque([start_idx])
+
+    while queue:
+        current = queue.popleft()
+        if goal_mask[current]:
+            return indices_to_path(parents, current, height)
+        for neighbor in neighbors[current]:
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                queue.append(neighbor)
     return []
 
 
@@ -135,7 +403,7 @@ def find_path(
     elif algorithm == "bfs":
         return bfs(
             start,
-            is_goal=lambda pos, path: pos == goal,
+            is_goal=lambda pos: pos == goal,
             forbidden=forbidden,
             width=width,
             height=height,
@@ -145,37 +413,50 @@ def find_path(
         raise ValueError(f"Unknown pathfinding algorithm: {algorithm}")
 
 
+# Old wall sets never come back once a wall is discovered, so a bounded cache loses nothing
+_PATH_CACHE_MAXSIZE = 4096
+
+
 def cached_path_decorator(func):
-    cache = {}
+    # Insertion ordered with hits re-inserted, so the first key is the least recently used
+    cache: dict[tuple, list[Coords]] = {}
+    # Keys of cached paths per (goal, walls, width, height), so a start lying on one of
+    # them can reuse its suffix without scanning the whole cache
+    by_goal: dict[tuple, list[tuple]] = {}
+
+    def store(key, path):
+        cache[key] = path
+        by_goal.setdefault(key[1:], []).append(key)
+        if len(cache) > _PATH_CACHE_MAXSIZE:
+            oldest = next(iter(cache))
+            del cache[oldest]
+            siblings = by_goal[oldest[1:]]
+            siblings.remove(oldest)
+            if not siblings:
+                del by_goal[oldest[1:]]
+        return path
 
     def wrapper(start, goal, forbidden, width, height):
-        cache_key = (start, goal, frozenset(forbidden), width, height)
+        # frozenset() of a frozenset is the same object, so shared wall sets are free
+        walls = frozenset(forbidden)
+        cache_key = (start, goal, walls, width, height)
+        path = cache.pop(cache_key, None)
+        if path is not None:
+            cache[cache_key] = path
+            return path
 
-        if cache_key not in cache:
-            inverse_key = (goal, start, frozenset(forbidden), width, height)
-            if inverse_key in cache:
-                cached_inverse_path = cache[inverse_key]
-                cache[cache_key] = cached_inverse_path[::-1]
-            else:
-                # Check if start is on any cached path to goal
-                for key, path in cache.items():
-                    if (
-                        key[1] == goal
-                        and key[2:] == (frozenset(forbidden), width, height)
-                        and start in path
-                    ):
-                        idx = path.index(start)
-                        cache[cache_key] = path[idx:]
-                        # print(
-                        #    "[Pathfinding] Cache hit by partial path", file=sys.stderr
-                        # )
-                        break
-                else:
-                    path = func(start, goal, forbidden, width, height)
-                    cache[cache_key] = path
-                if len(cache) % 200 == 0:
-                    print(f"[Pathfinding] Cache size: {len(cache)}", file=sys.stderr)
-        return cache[cache_key]
+        inverse_path = cache.get((goal, start, walls, width, height))
+        if inverse_path is not None:
+            return store(cache_key, inverse_path[::-1])
+        # Check if start is on any cached path to goal
+        for key in by_goal.get(cache_key[1:], ()):
+            path = cache[key]
+            if start in path:
+                return store(cache_key, path[path.index(start) :])
+        path = store(cache_key, func(start, goal, forbidden, width, height))
+        if len(cache) % 200 == 0:
+            print(f"[Pathfinding] Cache size: {len(cache)}", file=sys.stderr)
+        return path
 
     return wrapper
 
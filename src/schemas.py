@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field, fields
 from enum import Enum
-from functools import lru_cache
+from typing import NamedTuple
 
 _STR_MAP = {
     "LEFT": "W",
@@ -24,22 +24,13 @@ class BehaviourState(Enum):
     UNSTUCKING = 4
 
 
-@dataclass(frozen=True)
-class Coords:
+class Coords(NamedTuple):
+    # A tuple subclass: hashing, equality and ordering run in C, which matters for
+    # the large coordinate sets intersected every tick. Hash and (x, y) ordering are
+    # the same as the hand-written dataclass methods this replaces
     x: int
     y: int
 
-    def __eq__(self, other):
-        return isinstance(other, Coords) and self.x == other.x and self.y == other.y
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def __lt__(self, other):
-        if not isinstance(other, Coords):
-            return NotImplemented
-        return (self.x, self.y) < (other.x, other.y)
-
 
 class Direction(Enum):
     LEFT = Coords(-1, 0)
@@ -49,19 +40,20 @@ class Direction(Enum):
     WAIT = Coords(0, 0)
 
     @staticmethod
-    @lru_cache(maxsize=None)
     def from_delta(coords: Coords) -> "Direction":
-        for direction in Direction:
-            if coords == direction.value:
-                return direction
-        return Direction.WAIT
+        return _DELTA_TO_DIRECTION.get(coords, Direction.WAIT)
 
     @classmethod
     def to_str(cls, direction: "Direction") -> str:
-        return _STR_MAP[direction.name]
+        return _DIRECTION_TO_STR[direction]
+
+
+# Plain dict probes instead of an lru_cache wrapper and an enum scan per miss
+_DELTA_TO_DIRECTION: dict[Coords, Direction] = {d.value: d for d in Direction}
+_DIRECTION_TO_STR: dict[Direction, str] = {d: _STR_MAP[d.name] for d in Direction}
 
 
-@dataclass
+@dataclass(slots=True)
 class GameConfig:
     stage_key: str
     width: int
@@ -88,7 +80,7 @@ class GameConfig:
         return cls(**filtered)
 
 
-@dataclass
+@dataclass(slots=True)
 class Gem:
     position: Coords
     ttl: int
@@ -97,24 +89,17 @@ class Gem:
     reachable: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class EnemyBot:
     position: Coords
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Wall:
     position: Coords
 
 
-@dataclass(frozen=True)
-class Floor:
-    position: Coords
-    last_seen: int
-    gems_captured: int = 0
-
-
-@dataclass
+@dataclass(slots=True)
 class ViewPoint:
     position: Coords
     visible_tiles: set[Coords] = field(default_factory=set)
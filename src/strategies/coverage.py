@@ -6,7 +6,7 @@ from src.config import (
 )
 from src.debug import HighlightCoords, highlight_coords
 from src.gamestate import GameState, get_pre_filled_cached_path
-from src.schemas import Coords, Floor
+from src.schemas import Coords
 
 
 def coverage_planner(game_state: GameState) -> list[Coords]:
@@ -18,8 +18,8 @@ def coverage_planner(game_state: GameState) -> list[Coords]:
     gem_captured_tick = game_state.gem_captured_tick
     ticks_since_capture = current_tick - gem_captured_tick
 
-    def gem_score(floor_info: Floor):
-        ticks_after_capture = max(floor_info.last_seen - gem_captured_tick, 0)
+    def gem_score(last_seen: int):
+        ticks_after_capture = max(last_seen - gem_captured_tick, 0)
         ticks_unseen = ticks_since_capture - ticks_after_capture
         prob = 1 - (1 - gem_spawn_rate) ** ticks_unseen if ticks_unseen > 0 else 0
         recency_penalty = 1 / (1 + ticks_after_capture)
@@ -71,9 +71,9 @@ def coverage_evaluator(
     current_tick = game_state.tick
     refreshed_score = 0
     for coords in path:
-        floor_info = game_state.known_floors.get(coords)
-        if floor_info:
-            refreshed_score += current_tick - floor_info.last_seen
+        last_seen = game_state.known_floors.get(coords)
+        if last_seen is not None:
+            refreshed_score += current_tick - last_seen
 
     # Higher score for older tiles, shorter path preferred
     # You can adjust the weighting as needed
@@ -3,7 +3,6 @@ import sys
 from src.bot_logic import get_best_gem_collection_path
 from src.config import CENTER_MOVE_WEIGHT, CENTER_STAY_WEIGHT, DISTANCE_TO_ENEMY
 from src.gamestate import GameState, get_pre_filled_cached_path
-from src.pathfinding import manhattan
 from src.schemas import Coords
 
 
@@ -69,23 +68,27 @@ def advanced_search_evaluator(
     if game_state.config is None:
         return [], float("inf")
     bot_pos = game_state.bot
-    visible_enemies = game_state.visible_bots
-    closest_enemy = min(
-        visible_enemies,
-        key=lambda e: abs(e.position.x - bot_pos.x) + abs(e.position.y - bot_pos.y),
-        default=None,
-    )
+    bx, by = bot_pos.x, bot_pos.y
+    mx, my = move.x, move.y
+    closest_enemy = None
+    best_enemy_dist = 0
+    for enemy in game_state.visible_bots:
+        enemy_dist = abs(enemy.position.x - bx) + abs(enemy.position.y - by)
+        if closest_enemy is None or enemy_dist < best_enemy_dist:
+            closest_enemy, best_enemy_dist = enemy, enemy_dist
     center = game_state.center
+    cx, cy = center.x, center.y
     if bot_pos == center and move == center:
         return [], CENTER_STAY_WEIGHT  # Large negative score to prefer WAIT/stay
     # Penalize moving away from center if already there
     if bot_pos == center and move != center:
         if closest_enemy:
-            enemy_center_dist = manhattan(closest_enemy.position, center)
+            ex, ey = closest_enemy.position.x, closest_enemy.position.y
+            enemy_center_dist = abs(ex - cx) + abs(ey - cy)
             # If enemy is farther from center than DISTANCE_TO_ENEMY, follow at DISTANCE_TO_ENEMY
             if enemy_center_dist > DISTANCE_TO_ENEMY:
                 # Score moves that bring bot to DISTANCE_TO_ENEMY from enemy
-                enemy_dist = manhattan(move, closest_enemy.position)
+                enemy_dist = abs(mx - ex) + abs(my - ey)
                 score = abs(enemy_dist - DISTANCE_TO_ENEMY) + 2
                 path = get_pre_filled_cached_path(
                     start=game_state.bot,
@@ -98,12 +101,13 @@ def advanced_search_evaluator(
                     return path if path is not None else [], score
         # Default: discourage leaving center if not following enemy
         return [], CENTER_MOVE_WEIGHT
-    center_dist = manhattan(move, center)
+    center_dist = abs(mx - cx) + abs(my - cy)
     score = center_dist
     if closest_enemy:
-        enemy_center_dist = manhattan(closest_enemy.position, center)
-        bot_center_dist = manhattan(bot_pos, center)
-        enemy_dist = manhattan(move, closest_enemy.position)
+        ex, ey = closest_enemy.position.x, closest_enemy.position.y
+        enemy_center_dist = abs(ex - cx) + abs(ey - cy)
+        bot_center_dist = abs(bx - cx) + abs(by - cy)
+        enemy_dist = abs(mx - ex) + abs(my - ey)
         # If bot is at least DISTANCE_TO_ENEMY steps closer to center than enemy, move towards enemy
         if bot_center_dist <= enemy_center_dist - 1:
             score += enemy_dist
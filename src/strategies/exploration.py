@@ -1,6 +1,6 @@
 from src.debug import HighlightCoords, highlight_coords
 from src.gamestate import GameState, get_pre_filled_cached_path
-from src.pathfinding import manhattan
+from src.pathfinding import bfs_nearest
 from src.schemas import Coords
 
 
@@ -10,9 +10,22 @@ def cave_explore_planner(game_state: GameState) -> list[Coords]:
     highlight_coords.append(HighlightCoords("hidden_positions", hidden, "#e2d21a97"))
     if len(game_state.last_path) > 0 and game_state.last_path[-1] in hidden:
         candidates = [game_state.last_path[-1]]  # Continue to last target
+    elif not hidden:
+        candidates = []
     else:
-        candidates = sorted(hidden, key=lambda pos: manhattan(game_state.bot, pos))[:3]
-    highlight_coords.append(HighlightCoords("cave_explore_top3", candidates, "#b82d8a"))
+        # One BFS stops at the hidden tile nearest by path, not just by Manhattan
+        path = bfs_nearest(
+            game_state.bot,
+            set(hidden),
+            game_state.wall_grid,
+            game_state.config.width,
+            game_state.config.height,
+            game_state.get_neighbor_table(),
+        )
+        candidates = path[-1:]
+    highlight_coords.append(
+        HighlightCoords("cave_explore_target", candidates, "#b82d8a")
+    )
     return candidates
 
 
@@ -9,16 +9,12 @@ def oldest_floor_patrol_planner(game_state: GameState) -> list[Coords]:
     """
     Plan patrol moves to the oldest known floor positions.
     """
-    # Sort known floor positions by their last visited timestamp
-    sorted_floors = sorted(
-        game_state.known_floors.items(), key=lambda item: item[1].last_seen
-    )
+    # Only the least recently seen floor is used, so a linear min replaces the sort
+    oldest_floor, _ = min(game_state.known_floors.items(), key=lambda item: item[1])
 
-    highlight_coords.append(
-        HighlightCoords("oldest_floors", [sorted_floors[0][0]], "#00ffff")
-    )
+    highlight_coords.append(HighlightCoords("oldest_floors", [oldest_floor], "#00ffff"))
 
-    return [sorted_floors[0][0]]
+    return [oldest_floor]
 
 
 def simple_patrol_point_planner(game_state: GameState) -> list[Coords]:
@@ -51,9 +47,7 @@ def last_seen_sum_patrol_point_evaluator(
     criticality_factor = 1 + (ticks_since_last_capture / k) ** criticality_scaling
 
     for seen_tile in viewpoint.visible_tiles:
-        ticks_since_last_seen = abs(
-            current_tick - game_state.known_floors[seen_tile].last_seen
-        )
+        ticks_since_last_seen = abs(current_tick - game_state.known_floors[seen_tile])
         last_seen_sum += ticks_since_last_seen**recency_scaling * criticality_factor
     if False:
         print(
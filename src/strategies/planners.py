@@ -10,14 +10,19 @@ def advanced_search_planner(game_state: GameState) -> list[Coords]:
         print("GameConfig must be set to plan moves", file=sys.stderr)
         return [game_state.bot]
     directions = game_state.bot_adjacent_positions
+    width, height = game_state.config.width, game_state.config.height
+    walls = game_state.wall_positions
+    # recent_positions may be reassigned from outside, so the set is built from it
+    # here rather than kept alongside; the window is only a few tiles long
+    recent = set(game_state.recent_positions)
     # Filter out walls, out-of-bounds, and recent positions
     candidates = [game_state.bot] + [
         pos
         for pos in directions
-        if 0 <= pos.x < game_state.config.width
-        and 0 <= pos.y < game_state.config.height
-        and pos not in [w.position for w in game_state.wall]
-        and pos not in game_state.recent_positions
+        if 0 <= pos.x < width
+        and 0 <= pos.y < height
+        and pos not in walls
+        and pos not in recent
     ]
     if not candidates:
         candidates = [game_state.bot]
@@ -30,14 +35,17 @@ def simple_search_planner(game_state: GameState) -> list[Coords]:
         print("GameConfig must be set to plan moves", file=sys.stderr)
         return [game_state.bot]
     directions = game_state.bot_adjacent_positions
+    width, height = game_state.config.width, game_state.config.height
+    walls = game_state.wall_positions
+    recent = set(game_state.recent_positions)
     # Filter out walls and out-of-bounds
     candidates = [
         pos
         for pos in directions
-        if 0 <= pos.x < game_state.config.width
-        and 0 <= pos.y < game_state.config.height
-        and pos not in [w.position for w in game_state.wall]
-        and pos not in game_state.recent_positions
+        if 0 <= pos.x < width
+        and 0 <= pos.y < height
+        and pos not in walls
+        and pos not in recent
     ]
     if not candidates:
         candidates = [game_state.bot]
@@ -1,3 +1,4 @@
+import heapq
 import sys
 from itertools import combinations
 from typing import Callable
@@ -43,27 +44,30 @@ def solve_set_cover_optimal(
 def solve_set_cover(
     view_points: dict[Coords, set[Coords]], universe: set[Coords]
 ) -> set[Coords]:
-    """Solve the set cover problem using a greedy algorithm."""
-    covery_sets = view_points.copy()
+    """
+    Solve the set cover problem using a greedy algorithm.
+    Gains only shrink as elements get covered, so they sit in a lazy max-heap: a
+    popped entry is re-checked and pushed back if stale, instead of rescanning every
+    set per pick. Ties still go to the first set in view_points order.
+    """
+    order = list(view_points)
+    heap = [(-len(view_points[s]), i) for i, s in enumerate(order)]
+    heapq.heapify(heap)
     covered = set()
     selected_sets = set()
 
-    while covered != universe:
-        best_set = None
-        best_coverage = 0
-
-        for s, elements in covery_sets.items():
-            coverage = len(elements - covered)
-            if coverage > best_coverage:
-                best_coverage = coverage
-                best_set = s
-
-        if best_set is None:
+    while covered != universe and heap:
+        neg_gain, i = heapq.heappop(heap)
+        elements = view_points[order[i]]
+        gain = len(elements - covered)
+        if gain != -neg_gain:
+            heapq.heappush(heap, (-gain, i))
+            continue
+        if gain == 0:
             break  # No more sets can cover new elements
 
-        selected_sets.add(best_set)
-        covered.update(covery_sets[best_set])
-        del covery_sets[best_set]
+        selected_sets.add(order[i])
+        covered.update(elements)
 
     if covered == universe:
         return selected_sets
@@ -166,25 +170,22 @@ def set_cover_patrol(game_state: GameState, strategy: str = "anderes") -> list[C
     if game_state.behaviour_state != BehaviourState.PATROLLING:
         print("Switching to PATROLLING behaviour.", file=sys.stderr)
         game_state.behaviour_state = BehaviourState.PATROLLING
+        # Build the wall set once instead of once per scored patrol point
+        walls = game_state.known_wall_positions
+        width, height = game_state.config.width, game_state.config.height
         closest = min(
             game_state.patrol_points,
             key=lambda p: len(
-                cached_find_path(
-                    game_state.bot,
-                    p,
-                    game_state.known_wall_positions,
-                    game_state.config.width,
-                    game_state.config.height,
-                )
+                cached_find_path(game_state.bot, p, walls, width, height)
             ),
         )
         # Order patrol points starting from the closest
         ordered_route = order_patrol_points(
             closest,
             game_state.patrol_points,
-            game_state.known_wall_positions,
-            game_state.config.width,
-            game_state.config.height,
+            walls,
+            width,
+            height,
             set(game_state.patrol_points_visited),
         )
         game_state.patrol_route = ordered_route
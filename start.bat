@@ -1,2 +1,3 @@
 @echo off
-python bot.py
+if "%BOT_PYTHON%"=="" set BOT_PYTHON=python
+%BOT_PYTHON% bot.py
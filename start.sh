@@ -1,2 +1,3 @@
 #!/bin/sh
-python3 bot.py
+# Set BOT_PYTHON (e.g. pypy3) to run the bot under another interpreter
+exec "${BOT_PYTHON:-python3}" bot.py
@@ -1,7 +1,7 @@
 import timeit
 
 from src.gamestate import GameState
-from src.schemas import Coords, Floor, GameConfig
+from src.schemas import Coords, GameConfig
 
 
 def setup_gamestate():
@@ -28,7 +28,7 @@ def setup_gamestate():
         tick=0,
         bot=Coords(0, 0),
         wall=set(),
-        floor=set(),
+        floor={},
         initiative=True,
         visible_gems=[],
         visible_bots=[],
@@ -38,9 +38,7 @@ def setup_gamestate():
 
     for x in range(10, 40):
         for y in range(10, 40):
-            gs.known_floors[Coords(x, y)] = Floor(
-                position=Coords(x, y), last_seen=0
-            )  # Assign a valid Floor instance
+            gs.known_floors[Coords(x, y)] = 0  # Last seen at tick 0
     all_coords = set(
         Coords(x, y) for x in range(config.width) for y in range(config.height)
     )
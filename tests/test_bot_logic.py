@@ -0,0 +1,91 @@
+from src.bot_logic import (
+    check_reachable_gem,
+    get_adjacent_floors,
+    get_best_gem_collection_path,
+)
+from src.schemas import Coords, EnemyBot, Gem, Wall
+
+
+def test_gem_collection_visits_urgent_gem_first():
+    """
+    Corridor 0..6, bot at 3. The gem at 0 expires soon, so it must come first
+    even though the gem at 6 is just as close.
+    """
+    gems = [Gem(position=Coords(6, 0), ttl=20), Gem(position=Coords(0, 0), ttl=4)]
+    path = get_best_gem_collection_path(
+        bot_pos=Coords(3, 0),
+        gems=gems,
+        walls=set(),
+        width=7,
+        height=1,
+        enemies=[],
+        initiative=True,
+    )
+    assert path == [Coords(x, 0) for x in (3, 2, 1, 0, 1, 2, 3, 4, 5, 6)]
+
+
+def test_gem_collection_returns_none_when_a_gem_cannot_be_reached_in_time():
+    gems = [Gem(position=Coords(6, 0), ttl=3), Gem(position=Coords(0, 0), ttl=3)]
+    path = get_best_gem_collection_path(
+        bot_pos=Coords(3, 0),
+        gems=gems,
+        walls=set(),
+        width=7,
+        height=1,
+        enemies=[],
+        initiative=True,
+    )
+    assert path is None
+
+
+def test_gem_collection_computes_paths_when_caches_are_empty():
+    gems = [Gem(position=Coords(6, 0), ttl=20), Gem(position=Coords(0, 0), ttl=4)]
+    path = get_best_gem_collection_path(
+        bot_pos=Coords(3, 0),
+        gems=gems,
+        walls=set(),
+        width=7,
+        height=1,
+        enemies=[],
+        initiative=True,
+        distance_matrix={},
+        path_segments={},
+    )
+    assert path == [Coords(x, 0) for x in (3, 2, 1, 0, 1, 2, 3, 4, 5, 6)]
+
+
+def test_check_reachable_gem_prefers_distance_matrix():
+    bot, gem = Coords(0, 0), Gem(position=Coords(3, 0), ttl=3)
+    assert check_reachable_gem(bot, gem, set(), 4, 1)
+    # A matrix entry wins over a fresh search, including an unreachable one
+    assert not check_reachable_gem(
+        bot, gem, set(), 4, 1, distance_matrix={(bot, gem.position): float("inf")}
+    )
+    assert not check_reachable_gem(
+        bot, gem, set(), 4, 1, distance_matrix={(bot, gem.position): 5}
+    )
+
+
+def test_gem_collection_blocks_enemy_reach_without_initiative():
+    # The enemy sits beside the corridor: harmless when the bot moves first, but
+    # when the enemy moves first its next step covers the only route
+    gems = [Gem(position=Coords(4, 0), ttl=10)]
+    kwargs = dict(
+        bot_pos=Coords(0, 0),
+        gems=gems,
+        walls={Wall(position=Coords(x, 1)) for x in (0, 1, 3, 4)},
+        width=5,
+        height=2,
+        enemies=[EnemyBot(position=Coords(2, 1))],
+    )
+    path = get_best_gem_collection_path(initiative=True, **kwargs)
+    assert path == [Coords(x, 0) for x in range(5)]
+    assert get_best_gem_collection_path(initiative=False, **kwargs) is None
+
+
+def test_get_adjacent_floors_filters_bounds_and_unknown_tiles():
+    floors = {Coords(0, 0), Coords(1, 0), Coords(0, 1), Coords(-1, 0)}
+    assert get_adjacent_floors(Coords(0, 0), floors, 3, 3) == {
+        Coords(1, 0),
+        Coords(0, 1),
+    }
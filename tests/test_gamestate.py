@@ -0,0 +1,257 @@
+from collections import deque
+
+import pytest
+
+from src.gamestate import GameState
+from src.schemas import Coords, EnemyBot, GameConfig, Gem, ViewPoint, Wall
+from src.strategies.planners import simple_search_planner
+
+
+def make_gamestate(width=5, height=5, walls=()):
+    config = GameConfig(
+        width=width,
+        height=height,
+        stage_key="test_stage",
+        generator="",
+        max_ticks=1000,
+        emit_signals=True,
+        vis_radius=5,
+        max_gems=10,
+        gem_spawn_rate=0.1,
+        gem_ttl=50,
+        signal_radius=3,
+        signal_cutoff=0.5,
+        signal_noise=0.1,
+        signal_quantization=1,
+        signal_fade=1,
+        bot_seed=42,
+    )
+    return GameState(
+        tick=0,
+        bot=Coords(0, 0),
+        wall={Wall(position=pos) for pos in walls},
+        floor={},
+        initiative=False,
+        visible_gems=[],
+        visible_bots=[],
+        config=config,
+    )
+
+
+def test_update_recent_positions_rolls_window():
+    gs = make_gamestate()
+    gs.recent_positions = [Coords(3, 3), Coords(2, 2)]
+    for x in range(3):
+        gs.bot = Coords(x, 0)
+        gs.update_recent_positions(3)
+    assert isinstance(gs.recent_positions, deque)
+    assert list(gs.recent_positions) == [Coords(0, 0), Coords(1, 0), Coords(2, 0)]
+
+
+def test_search_planner_skips_assigned_recent_positions():
+    gs = make_gamestate()
+    gs.bot = Coords(2, 2)
+    gs.update_bot_adjacent_positions()
+    # Assigned directly, without going through update_recent_positions
+    gs.recent_positions = [Coords(1, 2), Coords(3, 2)]
+    assert set(simple_search_planner(gs)) == {Coords(2, 1), Coords(2, 3)}
+
+
+def test_update_known_gems_replaces_enemy_distances():
+    gs = make_gamestate()
+    gem = Gem(position=Coords(4, 0), ttl=10)
+    gs.known_gems = {gem.position: gem}
+    gs.visible_bots = [EnemyBot(position=Coords(4, 4))]
+    for _ in range(3):
+        gs.update_known_gems()
+    assert gem.distance2enemies == [4]
+
+
+def test_update_known_gems_marks_gems_beyond_ttl_unreachable():
+    gs = make_gamestate()
+    near, far = Gem(position=Coords(2, 0), ttl=5), Gem(position=Coords(4, 4), ttl=5)
+    gs.known_gems = {near.position: near, far.position: far}
+    gs.update_known_gems()
+    assert near.reachable and not far.reachable
+
+
+def test_hidden_positions_start_as_every_unknown_tile():
+    gs = make_gamestate(width=3, height=2, walls=[Coords(1, 1)])
+    assert gs.hidden_positions == {Coords(x, y) for x in range(3) for y in range(2)} - {
+        Coords(1, 1)
+    }
+
+
+def test_update_patrol_points_covers_floors_and_tracks_replaced_viewpoints():
+    gs = make_gamestate(width=4, height=1)
+    gs.known_floors = {Coords(x, 0): 0 for x in range(4)}
+    left, right = Coords(0, 0), Coords(3, 0)
+    gs.visibility_map = {
+        left: ViewPoint(position=left, visible_tiles={Coords(0, 0), Coords(1, 0)}),
+        right: ViewPoint(position=right, visible_tiles={Coords(3, 0)}),
+    }
+    gs.update_patrol_points()
+    assert gs.patrol_points == {left, right}
+    # A replaced viewpoint is re-read, not served from the cached bitset
+    gs.visibility_map[right] = ViewPoint(
+        position=right, visible_tiles={Coords(x, 0) for x in range(4)}
+    )
+    gs.update_patrol_points()
+    assert gs.patrol_points == {right}
+
+
+def test_recalculate_distance_matrix_drops_vanished_gems():
+    gs = make_gamestate()
+    a, b = Coords(4, 0), Coords(0, 4)
+    gs.known_gems = {a: Gem(position=a, ttl=10), b: Gem(position=b, ttl=10)}
+    gs.recalculate_distance_matrix()
+    assert gs.distance_matrix[(a, b)] == 9
+    del gs.known_gems[b]
+    gs.recalculate_distance_matrix()
+    assert all(b not in key for key in gs.distance_matrix)
+    assert all(b not in key for key in gs.path_segments)
+    assert b not in gs.matrix_keys_by_endpoint
+    assert all(
+        b not in key for keys in gs.matrix_keys_by_endpoint.values() for key in keys
+    )
+    assert gs.distance_matrix[(gs.bot, a)] == 5
+
+
+def test_update_known_floors_records_last_seen_tick():
+    gs = make_gamestate()
+    gs.floor = {Coords(0, 0): 1, Coords(1, 0): 1}
+    gs.update_known_floors()
+    gs.floor = {Coords(1, 0): 2}
+    gs.update_known_floors()
+    assert gs.known_floors == {Coords(0, 0): 1, Coords(1, 0): 2}
+
+
+def test_update_floor_graph_links_new_floors():
+    gs = make_gamestate()
+    # Floors seen this tick
+    gs.floor = {Coords(0, 0): 1, Coords(1, 0): 1}
+    gs.update_known_floors()
+    gs.update_floor_graph()
+    assert gs.floor_graph == {
+        Coords(0, 0): {Coords(1, 0)},
+        Coords(1, 0): {Coords(0, 0)},
+    }
+    # A floor added to known_floors directly is still picked up
+    gs.known_floors[Coords(1, 1)] = 1
+    gs.update_floor_graph()
+    assert gs.floor_graph[Coords(1, 1)] == {Coords(1, 0)}
+    assert gs.floor_graph[Coords(1, 0)] == {Coords(0, 0), Coords(1, 1)}
+
+
+def test_update_dead_ends_and_rooms_recomputes_only_when_graph_grows():
+    gs = make_gamestate()
+    gs.floor_graph = {Coords(0, 0): {Coords(1, 0)}, Coords(1, 0): {Coords(0, 0)}}
+    gs.update_dead_ends_and_rooms()
+    assert gs.dead_ends == {Coords(0, 0), Coords(1, 0)}
+    stale = gs.dead_ends
+    gs.update_dead_ends_and_rooms()
+    assert gs.dead_ends is stale
+    gs.floor_graph[Coords(1, 0)].add(Coords(2, 0))
+    gs.floor_graph[Coords(2, 0)] = {Coords(1, 0)}
+    gs.update_dead_ends_and_rooms()
+    assert gs.dead_ends == {Coords(0, 0), Coords(2, 0)}
+
+
+def test_update_from_dict_parses_tick_payload():
+    gs = make_gamestate()
+    gs.update_from_dict(
+        {
+            "tick": 7,
+            "bot": [1, 2],
+            "wall": [[0, 1]],
+            "floor": [[1, 2], [1, 3]],
+            "initiative": True,
+            "visible_gems": [{"position": [1, 3], "ttl": 9}],
+            "visible_bots": [{"position": [4, 4]}, {"position": [4]}],
+        }
+    )
+    assert gs.bot == Coords(1, 2)
+    assert gs.wall_positions == {Coords(0, 1)}
+    assert gs.floor == {Coords(1, 2): 7, Coords(1, 3): 7}
+    assert [(g.position, g.ttl) for g in gs.visible_gems] == [(Coords(1, 3), 9)]
+    assert [b.position for b in gs.visible_bots] == [Coords(4, 4)]
+    with pytest.raises(ValueError, match="floor"):
+        gs.update_from_dict({"tick": 8, "bot": [1, 2], "wall": []})
+    with pytest.raises(ValueError, match="ttl"):
+        gs.update_from_dict(
+            {
+                "tick": 8,
+                "bot": [1, 2],
+                "wall": [],
+                "floor": [],
+                "initiative": True,
+                "visible_gems": [{"position": [1, 3]}],
+            }
+        )
+
+
+def test_update_known_gems_keeps_distance_matrix_current():
+    gs = make_gamestate()
+    gem = Gem(position=Coords(2, 0), ttl=20)
+    gs.visible_gems = [gem]
+    gs.update_known_gems()
+    assert gs.distance_matrix[(gs.bot, gem.position)] == 3
+    # A wall found on the route lengthens the path even though nothing else moved
+    gs.wall = {Wall(position=Coords(1, 0))}
+    gs.update_known_walls()
+    gs.visible_gems = []
+    gs.update_known_gems()
+    assert gs.distance_matrix[(gs.bot, gem.position)] == 5
+    assert gs.path_segments[(gs.bot, gem.position)][-1] == gem.position
+
+
+def test_update_known_gems_reads_reachability_from_distance_matrix(monkeypatch):
+    def no_search(*args, **kwargs):
+        raise AssertionError("reachability should come from the distance matrix")
+
+    monkeypatch.setattr("src.bot_logic.cached_find_path", no_search)
+    gs = make_gamestate(walls=[Coords(1, 0), Coords(1, 1), Coords(1, 2)])
+    gs.bot = Coords(0, 1)
+    near, cut_off = (
+        Gem(position=Coords(0, 4), ttl=20),
+        Gem(position=Coords(4, 0), ttl=6),
+    )
+    gs.visible_gems = [near, cut_off]
+    gs.update_known_gems()
+    assert near.reachable
+    # Within its TTL by Manhattan distance, but the wall forces a nine step route
+    assert not cut_off.reachable
+
+
+def test_update_known_gems_follows_bot_to_known_gems():
+    gs = make_gamestate()
+    gem = Gem(position=Coords(4, 4), ttl=20)
+    gs.visible_gems = [gem]
+    gs.update_known_gems()
+    assert gs.distance_matrix[(gs.bot, gem.position)] == 9
+    # The gem set is unchanged, so only the bot row is searched again
+    gs.bot = Coords(2, 2)
+    gs.visible_gems = []
+    gs.update_known_gems()
+    assert gs.distance_matrix[(Coords(2, 2), gem.position)] == 5
+    assert gs.path_segments[(Coords(2, 2), gem.position)][0] == Coords(2, 2)
+
+
+def test_update_known_gems_drops_stale_matrix_rows():
+    gs = make_gamestate()
+    kept, expiring = (
+        Gem(position=Coords(4, 4), ttl=20),
+        Gem(position=Coords(4, 0), ttl=1),
+    )
+    gs.visible_gems = [kept, expiring]
+    gs.update_known_gems()
+    start = gs.bot
+    gs.bot = Coords(2, 2)
+    gs.visible_gems = []
+    gs.update_known_gems()
+    # The expired gem and the tile the bot left no longer appear in any key
+    assert all(
+        start not in key and expiring.position not in key for key in gs.distance_matrix
+    )
+    assert set(gs.distance_matrix) == set(gs.path_segments)
+    assert set(gs.matrix_keys_by_endpoint) == {Coords(2, 2), kept.position}
@@ -1,4 +1,14 @@
-from src.pathfinding import bfs, find_path, manhattan
+from src.pathfinding import (
+    bfs,
+    bfs_nearest,
+    bfs_paths,
+    build_neighbor_table,
+    build_wall_grid,
+    cached_path_decorator,
+    find_path,
+    label_components,
+    manhattan,
+)
 from src.schemas import Coords, Direction
 
 
@@ -18,7 +28,7 @@ def test_bfs_finds_path():
     width, height = 3, 1
     path = bfs(
         start,
-        is_goal=lambda pos, path: pos == goal,
+        is_goal=lambda pos: pos == goal,
         forbidden=walls,
         width=width,
         height=height,
@@ -34,7 +44,7 @@ def test_bfs_with_wall():
     width, height = 3, 1
     path = bfs(
         start,
-        is_goal=lambda pos, path: pos == goal,
+        is_goal=lambda pos: pos == goal,
         forbidden=walls,
         width=width,
         height=height,
@@ -43,6 +53,23 @@ def test_bfs_with_wall():
     assert path == []
 
 
+def test_bfs_predicate_reaches_nearest_target():
+    start = Coords(0, 0)
+    targets = {Coords(4, 0), Coords(0, 3)}
+    walls = {Coords(0, 1), Coords(1, 1)}
+    path = bfs(
+        start,
+        is_goal=lambda pos: pos in targets,
+        forbidden=walls,
+        width=5,
+        height=4,
+    )
+    assert path[0] == start
+    assert path[-1] == Coords(4, 0)
+    assert len(path) == 5
+    assert all(manhattan(a, b) == 1 for a, b in zip(path, path[1:]))
+
+
 def test_find_path_grid():
     start = Coords(0, 0)
     goal = Coords(2, 2)
@@ -75,3 +102,63 @@ def test_find_path_unreachable():
     width, height = 3, 3
     path = find_path(start, goal, walls, width, height)
     assert path == []
+
+
+def test_bfs_paths_matches_find_path_lengths():
+    start = Coords(0, 0)
+    walls = {Coords(1, 0), Coords(1, 1), Coords(3, 2), Coords(3, 3)}
+    targets = {Coords(2, 0), Coords(4, 4), Coords(0, 4)}
+    width, height = 5, 5
+    paths = bfs_paths(
+        start, targets, build_wall_grid(walls, width, height), width, height
+    )
+    assert set(paths) == targets
+    for target, path in paths.items():
+        assert path[0] == start
+        assert path[-1] == target
+        assert not walls.intersection(path)
+        assert len(path) == len(find_path(start, target, walls, width, height))
+
+
+def test_bfs_paths_skips_unreachable_targets():
+    start = Coords(0, 0)
+    walls = {Coords(1, 0), Coords(0, 1)}
+    paths = bfs_paths(start, {Coords(2, 2), start}, build_wall_grid(walls, 3, 3), 3, 3)
+    assert paths == {start: [start]}
+
+
+def test_label_components_splits_walled_regions():
+    walls = {Coords(2, 0), Coords(2, 1), Coords(2, 2)}
+    width, height = 4, 3
+    grid = build_wall_grid(walls, width, height)
+    labels = label_components(grid, build_neighbor_table(grid, width, height))
+    assert all(labels[2 * height + y] == -1 for y in range(height))
+    assert labels[0] == labels[1 * height + 2]
+    assert labels[0] != labels[3 * height]
+    assert labels[3 * height] == labels[3 * height + 2]
+
+
+def test_bfs_nearest_matches_predicate_bfs():
+    start = Coords(0, 0)
+    targets = {Coords(4, 0), Coords(0, 3)}
+    walls = {Coords(0, 1), Coords(1, 1)}
+    path = bfs_nearest(start, targets, build_wall_grid(walls, 5, 4), 5, 4)
+    assert path == bfs(
+        start, is_goal=targets.__contains__, forbidden=walls, width=5, height=4
+    )
+
+
+def test_cached_path_reuses_reverse_and_suffix_paths():
+    calls = []
+
+    def search(start, goal, forbidden, width, height):
+        calls.append((start, goal))
+        return find_path(start, goal, forbidden, width, height)
+
+    cached = cached_path_decorator(search)
+    walls = frozenset({Coords(1, 1)})
+    full = cached(Coords(0, 0), Coords(2, 2), walls, 3, 3)
+    assert cached(Coords(2, 2), Coords(0, 0), walls, 3, 3) == full[::-1]
+    assert cached(full[1], Coords(2, 2), walls, 3, 3) == full[1:]
+    assert cached(Coords(0, 0), Coords(2, 2), walls, 3, 3) is full
+    assert calls == [(Coords(0, 0), Coords(2, 2))]
@@ -9,7 +9,7 @@ def test_bfs_forbidden_cells():
     forbidden = {Coords(1, 0)}
     path = bfs(
         start,
-        is_goal=lambda pos, path: pos == goal,
+        is_goal=lambda pos: pos == goal,
         forbidden=forbidden,
         width=width,
         height=height,
@@ -26,7 +26,7 @@ def test_bfs_unreachable_goal():
     forbidden = {Coords(0, 1), Coords(1, 0)}
     path = bfs(
         start,
-        is_goal=lambda pos, path: pos == goal,
+        is_goal=lambda pos: pos == goal,
         forbidden=forbidden,
         width=width,
         height=height,
@@ -41,7 +41,7 @@ def test_bfs_start_equals_goal():
     width, height = 5, 5
     path = bfs(
         start,
-        is_goal=lambda pos, path: pos == goal,
+        is_goal=lambda pos: pos == goal,
         forbidden=set(),
         width=width,
         height=height,
@@ -56,7 +56,7 @@ def test_bfs_empty_grid():
     width, height = 1, 1
     path = bfs(
         start,
-        is_goal=lambda pos, path: pos == goal,
+        is_goal=lambda pos: pos == goal,
         forbidden=set(),
         width=width,
         height=height,
@@ -98,7 +98,7 @@ def test_bfs_performance_comparison():
     t0 = time.time()
     bfs_path = bfs(
         start,
-        is_goal=lambda pos, path: pos == goal,
+        is_goal=lambda pos: pos == goal,
         forbidden=forbidden,
         width=width,
         height=height,
@@ -1,7 +1,7 @@
 import pytest
 
 from src.gamestate import GameState
-from src.schemas import Coords, EnemyBot, Floor, GameConfig, ViewPoint
+from src.schemas import Coords, EnemyBot, GameConfig, ViewPoint
 from src.strategies.patrol import last_seen_sum_patrol_point_evaluator
 
 
@@ -30,11 +30,7 @@ def setup_gamestate():
         tick=100,
         bot=Coords(1, 1),
         wall=set(),
-        floor={
-            Floor(position=Coords(1, 2), last_seen=10),
-            Floor(position=Coords(2, 2), last_seen=90),
-            Floor(position=Coords(3, 3), last_seen=80),
-        },
+        floor={Coords(1, 2): 10, Coords(2, 2): 90, Coords(3, 3): 80},
         initiative=False,
         visible_gems=[],
         visible_bots=[EnemyBot(position=Coords(2, 2))],
@@ -43,9 +39,9 @@ def setup_gamestate():
     gs.gem_captured_tick = 50
     gs.recent_positions = [Coords(2, 2), Coords(3, 3)]
     gs.known_floors = {
-        Coords(1, 2): Floor(position=Coords(1, 2), last_seen=10),
-        Coords(2, 2): Floor(position=Coords(2, 2), last_seen=90),
-        Coords(3, 3): Floor(position=Coords(3, 3), last_seen=80),
+        Coords(1, 2): 10,
+        Coords(2, 2): 90,
+        Coords(3, 3): 80,
     }
     # gs.known_wall_positions = set()  # Ensure this is present for pathfinding
     gs.visibility_map = {
@@ -123,9 +119,7 @@ def test_last_seen_sum_patrol_point_evaluator_missing_known_floor(setup_gamestat
     setup_gamestate.visibility_map[move] = ViewPoint(
         position=move, visible_tiles={Coords(4, 4)}
     )
-    setup_gamestate.known_floors[Coords(4, 4)] = Floor(
-        position=Coords(4, 4), last_seen=0
-    )
+    setup_gamestate.known_floors[Coords(4, 4)] = 0
     path, score = last_seen_sum_patrol_point_evaluator(setup_gamestate, move)
     assert isinstance(path, list)
     assert isinstance(score, float)
@@ -138,9 +132,7 @@ def test_last_seen_sum_patrol_point_evaluator_missing_known_floor(setup_gamestat
 def test_last_seen_sum_patrol_point_evaluator_empty_visibility_map(setup_gamestate):
     move = Coords(5, 5)
     setup_gamestate.visibility_map[move] = ViewPoint(position=move, visible_tiles=set())
-    setup_gamestate.known_floors[Coords(5, 5)] = Floor(
-        position=Coords(5, 5), last_seen=0
-    )
+    setup_gamestate.known_floors[Coords(5, 5)] = 0
     path, score = last_seen_sum_patrol_point_evaluator(setup_gamestate, move)
     assert isinstance(path, list)
     assert isinstance(score, float)
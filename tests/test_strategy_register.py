@@ -1,4 +1,4 @@
-from src.gamestate import Floor, GameConfig, GameState, Gem, Wall
+from src.gamestate import GameConfig, GameState, Gem, Wall
 from src.schemas import Coords
 from src.strategy_register import (
     create_exploration_strategy,
@@ -29,9 +29,7 @@ def create_realistic_gamestate():
         bot_seed=42,
     )
     walls = {Wall(position=Coords(x, y)) for x, y in [(1, 1), (2, 2), (3, 3)]}
-    floors = {
-        Floor(position=Coords(x, y), last_seen=0) for x in range(10) for y in range(10)
-    }
+    floors = {Coords(x, y): 0 for x in range(10) for y in range(10)}
     gems = [Gem(position=Coords(5, 5), ttl=10, reachable=True)]
     bot_position = Coords(0, 0)
 